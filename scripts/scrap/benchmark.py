@@ -0,0 +1,313 @@
+"""
+Offline benchmark suite for the scraper pipeline.
+
+Times each stage against the checked-in fixtures (data/metrograph.html,
+data/metrograph_events.html, data/parsed_films.csv, data/skipped_films.csv,
+data/raw_events.json), optionally scaled up synthetically to thousands of
+cards. File-writing stages run inside a temporary directory that mirrors
+the repo layout, so the tracked data files are never touched.
+
+Results are compared against a JSON baseline by best-of-N time; any stage
+slower than the baseline by more than the tolerance fails the run.
+
+Usage (from the repo root):
+    python scripts/scrap/benchmark.py
+    python scripts/scrap/benchmark.py --scales 1 10 50 --repeats 7
+    python scripts/scrap/benchmark.py --update-baseline
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from parsing import CARD_CLASS, resolve_backend
+from extract import iter_films, iter_events
+from progress import (
+    open_progress, record_film, export_progress, clear_progress, DONE, SKIPPED,
+    PARSED_FINAL_FILE, PARSED_FILMS_FIELDS
+)
+from getShowtimes import add_events_to_films, _load_already_processed
+
+
+# Fixtures
+DATA_DIR = "./scripts/scrap/data"
+FILMS_HTML = f"{DATA_DIR}/metrograph.html"
+EVENTS_HTML = f"{DATA_DIR}/metrograph_events.html"
+RAW_EVENTS_FILE = f"{DATA_DIR}/raw_events.json"
+SKIPPED_FIXTURE = f"{DATA_DIR}/skipped_films.csv"
+
+# Baseline
+BASELINE_FILE = f"{DATA_DIR}/benchmark_baseline.json"
+REGRESSION_TOLERANCE = 0.5  # Fail when a stage is >50% slower than baseline
+NOISE_FLOOR_MS = 1.0  # Ignore slowdowns smaller than this in absolute terms
+
+DEFAULT_SCALES = [1, 50]
+DEFAULT_REPEATS = 5
+
+
+def _read_csv(path: str) -> List[Dict]:
+    """Read a CSV fixture into a list of row dicts."""
+    with open(path, "r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _write_csv(path: str, rows: List[Dict], fieldnames: List[str]) -> None:
+    """Write row dicts to a CSV file."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def scale_page(html: str, scale: int) -> str:
+    """
+    Scale a Metrograph page by repeating its cards.
+
+    The extra cards are inserted before </body>, so the rest of the page
+    stays as realistic as the fixture.
+
+    Args:
+        html: Fixture page html
+        scale: Total number of copies of each card
+
+    Returns:
+        Page html with scale times as many cards
+    """
+    if scale <= 1:
+        return html
+    soup = BeautifulSoup(html, "html.parser")
+    cards = "".join(str(card) for card in soup.find_all("div", class_=CARD_CLASS))
+    return html.replace("</body>", cards * (scale - 1) + "</body>", 1)
+
+
+def scale_rows(rows: List[Dict], scale: int) -> List[Dict]:
+    """
+    Scale a list of film or event rows, keeping titles unique per copy.
+
+    Args:
+        rows: Fixture rows
+        scale: Total number of copies of each row
+
+    Returns:
+        List of len(rows) * scale rows
+    """
+    scaled = list(rows)
+    for copy in range(1, scale):
+        scaled.extend({**row, "title": f"{row['title']} #{copy}"} for row in rows)
+    return scaled
+
+
+@contextlib.contextmanager
+def sandbox():
+    """Run inside a temporary directory laid out like the repo root."""
+    cwd = os.getcwd()
+    root = tempfile.mkdtemp(prefix="scrap-bench-")
+    try:
+        os.makedirs(os.path.join(root, "scripts", "scrap", "data"))
+        os.makedirs(os.path.join(root, "src", "lib", "data"))
+        os.chdir(root)
+        yield root
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _time(fn: Callable[[], None], repeats: int) -> List[float]:
+    """Run fn repeatedly with its output silenced, returning durations in ms."""
+    durations = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def bench_films_parse(scale: int, repeats: int) -> Tuple[int, List[float]]:
+    """Parse the films page fixture."""
+    with open(FILMS_HTML, "r", encoding="utf-8") as f:
+        html = scale_page(f.read(), scale)
+    items = len(list(iter_films(html)))
+    return items, _time(lambda: list(iter_films(html)), repeats)
+
+
+def bench_events_parse(scale: int, repeats: int) -> Tuple[int, List[float]]:
+    """Parse the events page fixture."""
+    with open(EVENTS_HTML, "r", encoding="utf-8") as f:
+        html = scale_page(f.read(), scale)
+    items = len(list(iter_events(html)))
+    return items, _time(lambda: list(iter_events(html)), repeats)
+
+
+def bench_merge(scale: int, repeats: int) -> Tuple[int, List[float]]:
+    """Merge raw events into the parsed films (add_events_to_films)."""
+    films = scale_rows(_read_csv(PARSED_FINAL_FILE), scale)
+    with open(RAW_EVENTS_FILE, "r", encoding="utf-8") as f:
+        events = scale_rows(json.load(f), scale)
+
+    with sandbox():
+        _write_csv(PARSED_FINAL_FILE, films, PARSED_FILMS_FIELDS)
+        with open(RAW_EVENTS_FILE, "w", encoding="utf-8") as f:
+            json.dump(events, f)
+        return len(films), _time(add_events_to_films, repeats)
+
+
+def bench_save_progress(scale: int, repeats: int) -> Tuple[int, List[float]]:
+    """Commit and append every film to fresh progress files, then export the CSVs."""
+    done = scale_rows(_read_csv(PARSED_FINAL_FILE), scale)
+    skipped = scale_rows(_read_csv(SKIPPED_FIXTURE), scale)
+    total = len(done) + len(skipped)
+
+    def run():
+        # Replay the scraper's pattern: one commit per film
+        clear_progress()
+        progress = open_progress()
+        for film in done:
+            record_film(progress, film, DONE)
+        for film in skipped:
+            record_film(progress, film, SKIPPED)
+        export_progress(progress)
+        progress.close()
+
+    with sandbox():
+        return total, _time(run, repeats)
+
+
+def bench_resume_load(scale: int, repeats: int) -> Tuple[int, List[float]]:
+    """Load already-processed titles from the progress database."""
+    done = scale_rows(_read_csv(PARSED_FINAL_FILE), scale)
+    skipped = scale_rows(_read_csv(SKIPPED_FIXTURE), scale)
+
+    with sandbox():
+        progress = open_progress()
+        for film in done:
+            record_film(progress, film, DONE)
+        for film in skipped:
+            record_film(progress, film, SKIPPED)
+        try:
+            return len(done) + len(skipped), _time(lambda: _load_already_processed(progress), repeats)
+        finally:
+            progress.close()
+
+
+STAGES = {
+    "films_parse": bench_films_parse,
+    "events_parse": bench_events_parse,
+    "merge": bench_merge,
+    "save_progress": bench_save_progress,
+    "resume_load": bench_resume_load,
+}
+
+
+def run_benchmarks(stages: List[str], scales: List[int], repeats: int) -> Dict[str, Dict]:
+    """
+    Time every stage at every scale.
+
+    Args:
+        stages: Stage names from STAGES
+        scales: Fixture scale factors
+        repeats: Timed runs per stage
+
+    Returns:
+        Dict of "stage@xN" -> {"items", "median_ms", "min_ms"}
+    """
+    results = {}
+    for scale in scales:
+        for stage in stages:
+            items, durations = STAGES[stage](scale, repeats)
+            key = f"{stage}@x{scale}"
+            results[key] = {
+                "items": items,
+                "median_ms": round(statistics.median(durations), 3),
+                "min_ms": round(min(durations), 3),
+            }
+            print(f"⏱️  {key:<24} {items:>7} items  "
+                  f"median {results[key]['median_ms']:>10.2f} ms  min {results[key]['min_ms']:>10.2f} ms")
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Find stages that regressed against the baseline.
+
+    Args:
+        results: Current results from run_benchmarks()
+        baseline: Baseline results
+        tolerance: Allowed slowdown as a fraction of the baseline time
+
+    Returns:
+        Human-readable description of each regression
+    """
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if not previous or not previous.get("min_ms"):
+            continue
+        # Best-of-N is far less noisy than the median for short stages
+        ratio = result["min_ms"] / previous["min_ms"]
+        slowdown = result["min_ms"] - previous["min_ms"]
+        if ratio > 1 + tolerance and slowdown > NOISE_FLOOR_MS:
+            regressions.append(
+                f"{key}: {result['min_ms']:.2f} ms vs baseline "
+                f"{previous['min_ms']:.2f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--scales", nargs="+", type=int, default=DEFAULT_SCALES)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run")
+    args = parser.parse_args(argv)
+
+    print(f"🏁 Benchmarking with parser backend {resolve_backend()}, {args.repeats} runs per stage")
+    results = run_benchmarks(args.stages, args.scales, args.repeats)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "backend": resolve_backend(),
+        "results": results,
+    }
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    if baseline.get("backend") != report["backend"]:
+        print(f"⚠️  Baseline was recorded with parser backend {baseline.get('backend')}")
+
+    regressions = compare_to_baseline(results, baseline.get("results", {}), args.tolerance)
+    if regressions:
+        print(f"❌ {len(regressions)} stage(s) regressed by more than {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+
+    print(f"✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
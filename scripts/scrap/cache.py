@@ -0,0 +1,160 @@
+"""
+Persistent Letterboxd rating cache.
+
+Ratings are stored on disk keyed by normalized (title, year, director)
+with the time they were fetched, so films that stay on Metrograph's
+calendar from one run to the next are not scraped again until their
+entry goes stale.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from helpers import normalize_text
+
+
+# File path
+RATING_CACHE_FILE = "./scripts/scrap/data/rating_cache.json"
+
+# How long a cached rating is served before it is scraped again
+RATING_CACHE_TTL_HOURS = float(os.environ.get("RATING_CACHE_TTL_HOURS", "72"))
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def film_cache_key(film: Dict) -> str:
+    """
+    Build the cache key for a film.
+
+    Args:
+        film: Film dict with title, year and directors
+
+    Returns:
+        Key of the form "title|year|first director", all normalized
+    """
+    directors = film.get("directors") or []
+    if isinstance(directors, str):
+        directors = [directors]
+    director = directors[0] if directors else ""
+
+    return "|".join([
+        normalize_text(film.get("title", "")),
+        str(film.get("year", "")).strip(),
+        normalize_text(director)
+    ])
+
+
+def load_rating_cache(path: str = RATING_CACHE_FILE) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the rating cache from disk.
+
+    Args:
+        path: Cache file location
+
+    Returns:
+        Dict of cache key -> entry (empty if no cache exists yet)
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        print(f"🗃️  Loaded rating cache: {len(cache)} entries")
+        return cache
+    except FileNotFoundError:
+        print("🗃️  No rating cache found, starting empty")
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"⚠️  Rating cache is unreadable, starting empty: {e}")
+        return {}
+
+
+def get_fresh_rating(
+    cache: Dict[str, Dict[str, Any]],
+    film: Dict,
+    ttl_hours: float = RATING_CACHE_TTL_HOURS,
+    now: Optional[datetime] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Look up a film's cached rating if it is still fresh.
+
+    Args:
+        cache: Rating cache dict
+        film: Film dict to look up
+        ttl_hours: Maximum age of an entry before it is considered stale
+        now: Current time (defaults to utcnow)
+
+    Returns:
+        The cache entry, or None if missing or stale
+    """
+    entry = cache.get(film_cache_key(film))
+    if not entry or not entry.get("rating"):
+        return None
+
+    try:
+        fetched_at = datetime.strptime(entry["fetched_at"], TIMESTAMP_FORMAT)
+    except (KeyError, ValueError):
+        return None
+
+    now = now or datetime.utcnow()
+    if now - fetched_at > timedelta(hours=ttl_hours):
+        return None
+
+    return entry
+
+
+def get_known_url(cache: Dict[str, Dict[str, Any]], film: Dict) -> Optional[str]:
+    """
+    Look up the Letterboxd URL a film was last resolved to, however old.
+
+    Args:
+        cache: Rating cache dict
+        film: Film dict to look up
+
+    Returns:
+        The film page URL, or None if the film was never resolved
+    """
+    entry = cache.get(film_cache_key(film))
+    return (entry or {}).get("letterboxd_url") or None
+
+
+def store_rating(
+    cache: Dict[str, Dict[str, Any]],
+    film: Dict,
+    now: Optional[datetime] = None
+) -> None:
+    """
+    Record a freshly scraped rating in the cache.
+
+    Args:
+        cache: Rating cache dict (modified in place)
+        film: Film dict with rating and letterboxd_url set
+        now: Fetch time (defaults to utcnow)
+    """
+    now = now or datetime.utcnow()
+    cache[film_cache_key(film)] = {
+        "title": film.get("title", ""),
+        "rating": film.get("rating", ""),
+        "letterboxd_url": film.get("letterboxd_url", ""),
+        "fetched_at": now.strftime(TIMESTAMP_FORMAT)
+    }
+
+
+def save_rating_cache(
+    cache: Dict[str, Dict[str, Any]],
+    path: str = RATING_CACHE_FILE
+) -> None:
+    """
+    Write the rating cache to disk.
+
+    Writes to a temporary file first and renames it into place so an
+    interrupted run never leaves a truncated cache behind.
+
+    Args:
+        cache: Rating cache dict
+        path: Cache file location
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -0,0 +1,296 @@
+"""
+Record/replay of every page the scraper loads.
+
+With SCRAPER_CASSETTE=record, each HTTP response received through
+requests (including redirects) and each page the browser finishes
+rendering is stored in a cassette directory: bodies content-addressed
+under bodies/, and index.json mapping "host/path?query" to status,
+headers and body for the "http" and "page" kinds. Cache-busting
+parameters are dropped from keys. Browser snapshots are stored with
+their scripts stripped, so replaying them renders the recorded DOM and
+nothing else. They are taken once any challenge has been dealt with; a
+snapshot that still showed a block is marked as such and replaced by
+the first clean one of the same URL.
+
+With SCRAPER_CASSETTE=replay, one local HTTP server per recorded host
+is started in-process, and route() points requests and the browser at
+them; original_url() maps links read back from the browser to the real
+site. Browser navigations (Sec-Fetch-Mode: navigate) get the page
+snapshot, everything else the HTTP response; HEAD requests get its
+headers. ETags are honoured, so conditional requests replay as 304s.
+Hosts that were never recorded are routed to a server that answers
+404, so a replay never reaches the network.
+
+In either mode, isolate() moves the run into a scratch copy of the data
+directories without the state earlier runs left behind (validators,
+caches, progress), so recording and replaying both start cold, run end
+to end, and never write tracked files.
+
+Usage (from the repo root):
+    SCRAPER_CASSETTE=record python scripts/scrap/pipeline.py
+    SCRAPER_CASSETTE=replay LETTERBOXD_MAX_REQUESTS_PER_MINUTE=6000 python scripts/scrap/pipeline.py
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+
+# Off unless set to "record" or "replay"
+CASSETTE_MODE = os.environ.get("SCRAPER_CASSETTE", "").lower()
+# Absolute, so it still resolves after isolate() changes directory
+CASSETTE_DIR = os.path.abspath(os.environ.get("SCRAPER_CASSETTE_DIR", "./scripts/scrap/data/cassette"))
+
+# Copied into the scratch directory, without the state files and captures below
+ISOLATED_DIRS = ("scripts/scrap/data", "src/lib/data")
+STATE_FILES = {
+    "fetch_state.json", "rating_cache.json", "letterboxd_urls.json", "poster_manifest.json",
+    "progress.sqlite3", "progress.jsonl", "spans.jsonl", "screenshots", "page_html"
+}
+SCRATCH_DIRS = ("static/data", "static/posters", "scripts/scrap/data/screenshots", "scripts/scrap/data/page_html")
+
+# Response headers worth replaying; bodies are stored decoded
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date", "Cache-Control", "Location")
+
+# Query parameters that only bust caches
+IGNORED_PARAMS = {"_ts"}
+
+HTTP, PAGE = "http", "page"
+
+SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script>", re.DOTALL | re.IGNORECASE)
+
+_index: Optional[Dict[str, Dict[str, Any]]] = None
+_lock = threading.Lock()
+_servers: Dict[str, str] = {}  # host -> local base URL while replaying
+_miss_server: Optional[str] = None  # base URL answering 404 for unrecorded hosts
+
+
+def cassette_key(url: str) -> str:
+    """Identify a URL by host, path and meaningful query parameters."""
+    parts = urlparse(url)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in IGNORED_PARAMS])
+    return f"{parts.netloc}{parts.path or '/'}" + (f"?{query}" if query else "")
+
+
+def _load_index(directory: str = CASSETTE_DIR) -> Dict[str, Dict[str, Any]]:
+    global _index
+    if _index is None:
+        try:
+            with open(os.path.join(directory, "index.json"), "r", encoding="utf-8") as f:
+                _index = json.load(f)
+        except FileNotFoundError:
+            _index = {}
+    return _index
+
+
+def _store(
+    kind: str,
+    url: str,
+    status: int,
+    headers: Dict[str, str],
+    body: bytes,
+    blocked: Optional[str] = None,
+    directory: str = CASSETTE_DIR
+) -> None:
+    """Add one response to the cassette (the first good one per key and kind wins)."""
+    key = cassette_key(url)
+    digest = hashlib.sha256(body).hexdigest()
+    os.makedirs(os.path.join(directory, "bodies"), exist_ok=True)
+
+    with _lock:
+        index = _load_index(directory)
+        recorded = index.get(key, {}).get(kind)
+        # A later 200 replaces a 304 recorded by a conditional request, and a
+        # clean page replaces one that showed a block
+        if recorded and not (
+            (recorded["status"] == 304 and status == 200)
+            or (recorded.get("blocked") and not blocked)
+        ):
+            return
+
+        body_path = os.path.join(directory, "bodies", digest)
+        if not os.path.exists(body_path):
+            with open(body_path, "wb") as f:
+                f.write(body)
+        entry = {
+            "status": status,
+            "headers": {name: headers[name] for name in KEPT_HEADERS if headers.get(name)},
+            "body": digest
+        }
+        if blocked:
+            entry["blocked"] = blocked
+        index.setdefault(key, {})[kind] = entry
+
+        tmp_path = os.path.join(directory, "index.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(directory, "index.json"))
+
+
+def record_http(response, *args, **kwargs) -> None:
+    """requests response hook: store the response and any redirects before it."""
+    if CASSETTE_MODE != "record":
+        return
+    for hop in [*response.history, response]:
+        # HEAD probes are answered from the GET entries when replaying
+        if hop.request.method != "GET":
+            continue
+        _store(HTTP, hop.request.url, hop.status_code, hop.headers, hop.content)
+
+
+def attach(session):
+    """Record a requests session's responses when recording; returns the session."""
+    session.hooks["response"].append(record_http)
+    return session
+
+
+def record_page(driver, url: str, blocked: Optional[str] = None) -> None:
+    """
+    Store the browser's rendered page for a URL when recording.
+
+    Args:
+        driver: Browser showing the page
+        url: The page's real URL
+        blocked: What detect_block() found on the page, if anything
+    """
+    if CASSETTE_MODE != "record":
+        return
+    try:
+        html = SCRIPT_RE.sub("", driver.page_source)
+    except Exception as e:
+        print(f"⚠️  Could not record page {url}: {e}")
+        return
+    _store(PAGE, url, 200, {"Content-Type": "text/html; charset=utf-8"}, html.encode("utf-8"), blocked)
+
+
+def _make_handler(host: str, index: Dict[str, Dict[str, Any]], directory: str):
+    """Build a request handler class replaying one host's entries."""
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.do_GET(head=True)
+
+        def do_GET(self, head=False):
+            entries = index.get(cassette_key(f"//{host}{self.path}"), {})
+            order = (PAGE, HTTP) if self.headers.get("Sec-Fetch-Mode") == "navigate" else (HTTP, PAGE)
+            entry = next((entries[kind] for kind in order if kind in entries), None)
+            if entry is None:
+                print(f"📼 Cassette miss: {host}{self.path}")
+                self.send_error(404, "Not in cassette")
+                return
+
+            status, body = entry["status"], b""
+            etag = entry["headers"].get("ETag")
+            if etag and self.headers.get("If-None-Match") == etag:
+                status = 304
+            elif status != 304:
+                with open(os.path.join(directory, "bodies", entry["body"]), "rb") as f:
+                    body = f.read()
+
+            self.send_response(status)
+            for name, value in entry["headers"].items():
+                self.send_header(name, route(value) if name == "Location" else value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler
+
+
+def _serve(host: str, entries: Dict[str, Dict[str, Any]], directory: str) -> str:
+    """Start one replay server in a daemon thread; returns its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(host, entries, directory))
+    threading.Thread(target=server.serve_forever, name=f"replay-{host}", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def start_replay(directory: str = CASSETTE_DIR) -> Dict[str, str]:
+    """
+    Serve a cassette, one local server per recorded host.
+
+    Returns:
+        Dict of host -> local base URL
+    """
+    global _miss_server
+    with _lock:
+        if _servers:
+            return _servers
+        index = _load_index(directory)
+        by_host = {}
+        for key, entries in index.items():
+            by_host.setdefault(key.split("/", 1)[0], {})[key] = entries
+
+        for host, entries in by_host.items():
+            _servers[host] = _serve(host, entries, directory)
+        _miss_server = _serve("unrecorded", {}, directory)
+        print(f"📼 Replaying {len(index)} recorded URLs from {directory} ({len(_servers)} hosts)")
+    return _servers
+
+
+def route(url: str) -> str:
+    """
+    The URL to actually load: the local replay server's when replaying.
+
+    A host missing from the cassette goes to a server that answers 404
+    rather than to the network.
+    """
+    if CASSETTE_MODE != "replay" or not url:
+        return url
+    parts = urlparse(url)
+    base = start_replay().get(parts.netloc)
+    if base is None:
+        print(f"📼 Cassette miss: {parts.netloc} was never recorded")
+        base = _miss_server
+    local = urlparse(base)
+    return urlunparse(parts._replace(scheme=local.scheme, netloc=local.netloc))
+
+
+def isolate() -> Optional[str]:
+    """
+    When recording or replaying, continue the run in a scratch copy of
+    the data directories, without state files, and return its path.
+
+    Call at process start, before anything reads a data file. Does
+    nothing (returns None) when no cassette is in use.
+    """
+    if CASSETTE_MODE not in ("record", "replay"):
+        return None
+    workdir = tempfile.mkdtemp(prefix=f"scrap-{CASSETTE_MODE}-")
+
+    def ignore(directory, names):
+        return [
+            name for name in names
+            if name in STATE_FILES or os.path.abspath(os.path.join(directory, name)) == CASSETTE_DIR
+        ]
+
+    for path in ISOLATED_DIRS:
+        if os.path.isdir(path):
+            shutil.copytree(path, os.path.join(workdir, path), ignore=ignore)
+    for path in SCRATCH_DIRS:
+        os.makedirs(os.path.join(workdir, path), exist_ok=True)
+
+    os.chdir(workdir)
+    print(f"📼 Cassette {CASSETTE_MODE}: running cold in {workdir}, tracked files are left alone")
+    return workdir
+
+
+def original_url(url: str) -> str:
+    """Map a URL read back from the browser to the recorded site's."""
+    if CASSETTE_MODE != "replay" or not url:
+        return url
+    parts = urlparse(url)
+    for host, base in _servers.items():
+        if urlparse(base).netloc == parts.netloc:
+            return urlunparse(parts._replace(scheme="https", netloc=host))
+    return url
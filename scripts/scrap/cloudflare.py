@@ -21,6 +21,9 @@ TURNSTILE_IFRAME_SELECTOR = "iframe[src*='turnstile'], iframe[src*='challenge']"
 # Keywords that indicate a Turnstile challenge is present
 CHALLENGE_KEYWORDS = ["verify you are human", "turnstile"]
 
+# Keywords that indicate we are being rate limited
+RATE_LIMIT_KEYWORDS = ["too many requests", "error 1015", "you are being rate limited"]
+
 
 def _is_page_loaded(driver) -> bool:
     """Check if the actual content page is already loaded (no challenge)."""
@@ -37,6 +40,31 @@ def _has_turnstile_challenge(driver) -> bool:
     return any(keyword in page_source for keyword in CHALLENGE_KEYWORDS)
 
 
+def _is_rate_limited(driver) -> bool:
+    """Check if the page is a rate-limit (HTTP 429 / Cloudflare 1015) response."""
+    page_text = f"{driver.title} {driver.page_source[:5000]}".lower()
+    return any(keyword in page_text for keyword in RATE_LIMIT_KEYWORDS)
+
+
+def detect_block(driver):
+    """
+    Classify the current page for request pacing.
+    
+    Returns:
+        "rate_limited", "challenge", or None if the page looks normal
+    """
+    try:
+        if _is_page_loaded(driver):
+            return None
+        if _is_rate_limited(driver):
+            return "rate_limited"
+        if _has_turnstile_challenge(driver):
+            return "challenge"
+    except Exception:
+        pass
+    return None
+
+
 def _wait_for_content(driver, timeout: int) -> bool:
     """Wait for the content page to load. Returns True if successful."""
     try:
@@ -1,11 +1,24 @@
 """
-Debug utilities for saving screenshots and HTML during scraping.
+Debug capture of screenshots and HTML during scraping.
 
-These functions help diagnose issues by capturing the browser state
-when errors occur or at key checkpoints.
+Captures are taken on every error and on a sample of successes
+(DEBUG_SUCCESS_SAMPLE_RATE). Only grabbing the bytes from the browser
+happens on the scraping thread; compressing, deduplicating by content
+hash and writing are done by a background writer, which drops captures
+rather than stall scraping when it falls behind. Each capture directory
+is kept within a file count and byte budget, oldest files first out.
+
+Call flush_captures() before exiting so queued captures are written.
 """
 
+import gzip
+import hashlib
 import os
+import queue
+import random
+import threading
+from typing import Optional
+
 from helpers import sanitize_filename
 
 
@@ -13,70 +26,144 @@ from helpers import sanitize_filename
 SCREENSHOT_DIR = "./scripts/scrap/data/screenshots"
 HTML_DIR = "./scripts/scrap/data/page_html"
 
+# Share of successful lookups that are captured anyway
+SUCCESS_SAMPLE_RATE = float(os.environ.get("DEBUG_SUCCESS_SAMPLE_RATE", "0.05"))
+
+# Retention, per directory
+MAX_CAPTURES = int(os.environ.get("DEBUG_MAX_CAPTURES", "100"))
+MAX_CAPTURE_BYTES = int(float(os.environ.get("DEBUG_MAX_CAPTURE_MB", "20")) * 1024 * 1024)
+
+QUEUE_SIZE = 32  # captures waiting to be written before new ones are dropped
+
+_queue: "queue.Queue" = queue.Queue(maxsize=QUEUE_SIZE)
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_seen_hashes = {}  # content hash -> path already written this run
+
+
+def _enqueue(directory: str, filename: str, data: bytes, compress: bool) -> bool:
+    """Hand a capture to the background writer, starting it if needed."""
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_write_captures, name="debug-writer", daemon=True)
+            _writer.start()
+
+    try:
+        _queue.put_nowait((directory, filename, data, compress))
+        return True
+    except queue.Full:
+        print(f"⚠️  Debug capture queue full, dropping {filename}")
+        return False
+
+
+def _write_captures() -> None:
+    """Background writer: compress, dedup, write and prune."""
+    while True:
+        directory, filename, data, compress = _queue.get()
+        try:
+            _write_capture(directory, filename, data, compress)
+        except Exception as e:
+            print(f"⚠️  Could not write debug capture {filename}: {e}")
+        finally:
+            _queue.task_done()
+
+
+def _write_capture(directory: str, filename: str, data: bytes, compress: bool) -> None:
+    """Write one capture unless identical content was already written."""
+    digest = hashlib.sha256(data).hexdigest()
+    if digest in _seen_hashes and os.path.exists(_seen_hashes[digest]):
+        print(f"🗂️  {filename} is identical to {_seen_hashes[digest]}, not saved again")
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    if compress:
+        filename += ".gz"
+        # mtime=0 keeps identical pages byte-identical on disk
+        data = gzip.compress(data, mtime=0)
+    filepath = os.path.join(directory, filename)
+
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, filepath)
+    _seen_hashes[digest] = filepath
+    print(f"🗂️  Debug capture saved: {filepath} ({len(data) / 1024:.0f}KB)")
 
-def save_screenshot(driver, film_title: str, prefix: str = "") -> bool:
+    _prune(directory)
+
+
+def _prune(directory: str) -> None:
+    """Delete the oldest captures beyond the count and byte budgets."""
+    entries = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path) and not name.endswith(".tmp"):
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    entries.sort(reverse=True)
+    kept_bytes = 0
+    for count, (_, size, path) in enumerate(entries, start=1):
+        kept_bytes += size
+        if count > MAX_CAPTURES or kept_bytes > MAX_CAPTURE_BYTES:
+            os.remove(path)
+            print(f"🗑️  Pruned old debug capture: {path}")
+
+
+def save_screenshot(driver, film_title: str, prefix: str = "", sample_rate: float = 1.0) -> bool:
     """
-    Save a screenshot of the current browser state.
-    
+    Capture a screenshot of the current browser state.
+
     Args:
         driver: Selenium/SeleniumBase WebDriver instance
         film_title: Title used for the filename
         prefix: Optional prefix (e.g., "ERROR_" for failed attempts)
-    
+        sample_rate: Probability of actually capturing
+
     Returns:
-        True if screenshot was saved successfully, False otherwise
+        True if a screenshot was queued for writing, False otherwise
     """
+    if sample_rate < 1.0 and random.random() >= sample_rate:
+        return False
     try:
-        os.makedirs(SCREENSHOT_DIR, exist_ok=True)
-        filename = f"{prefix}{sanitize_filename(film_title)}.png"
-        filepath = os.path.join(SCREENSHOT_DIR, filename)
-        
-        driver.save_screenshot(filepath)
-        print(f"📸 Screenshot saved: {filepath}")
-        return True
-        
+        png = driver.get_screenshot_as_png()
     except Exception as e:
         print(f"⚠️  Could not save screenshot: {e}")
         return False
+    # PNGs are already compressed
+    return _enqueue(SCREENSHOT_DIR, f"{prefix}{sanitize_filename(film_title)}.png", png, compress=False)
 
 
 def save_page_html(driver, film_title: str, prefix: str = "") -> bool:
     """
-    Save the HTML source of the current page.
-    
+    Capture the HTML source of the current page, gzipped.
+
     Useful for debugging when the page structure is unexpected
     or when Cloudflare challenges appear.
-    
+
     Args:
         driver: Selenium/SeleniumBase WebDriver instance
         film_title: Title used for the filename
         prefix: Optional prefix (e.g., "ERROR_" for failed attempts)
-    
+
     Returns:
-        True if HTML was saved successfully, False otherwise
+        True if the HTML was queued for writing, False otherwise
     """
     try:
-        os.makedirs(HTML_DIR, exist_ok=True)
-        filename = f"{prefix}{sanitize_filename(film_title)}.html"
-        filepath = os.path.join(HTML_DIR, filename)
-        
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-        
-        print(f"📄 Page HTML saved: {filepath}")
-        return True
-        
+        html = driver.page_source.encode("utf-8")
     except Exception as e:
         print(f"⚠️  Could not save page HTML: {e}")
         return False
+    return _enqueue(HTML_DIR, f"{prefix}{sanitize_filename(film_title)}.html", html, compress=True)
 
 
 def save_debug_info(driver, film_title: str, prefix: str = "ERROR_") -> None:
     """
-    Convenience function to save both screenshot and HTML.
-    
-    Typically called when an error occurs during scraping.
-    
+    Convenience function to capture both screenshot and HTML.
+
+    Called whenever a lookup fails, so it is never sampled.
+
     Args:
         driver: Selenium/SeleniumBase WebDriver instance
         film_title: Title used for filenames
@@ -84,3 +171,13 @@ def save_debug_info(driver, film_title: str, prefix: str = "ERROR_") -> None:
     """
     save_screenshot(driver, film_title, prefix)
     save_page_html(driver, film_title, prefix)
+
+
+def flush_captures(timeout: float = 30.0) -> None:
+    """Wait (up to timeout seconds) for queued captures to be written."""
+    if _writer is None:
+        return
+    done = threading.Event()
+    threading.Thread(target=lambda: (_queue.join(), done.set()), daemon=True).start()
+    if not done.wait(timeout):
+        print(f"⚠️  {_queue.qsize()} debug capture(s) still unwritten after {timeout:.0f}s")
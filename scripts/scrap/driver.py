@@ -17,7 +17,6 @@ USER_AGENT = (
 )
 
 PAGE_LOAD_TIMEOUT = 120  # seconds
-RESTART_EVERY_N_FILMS = 50  # Restart browser periodically to prevent memory issues
 
 
 def create_driver(is_ci: bool = None):
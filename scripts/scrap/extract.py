@@ -0,0 +1,199 @@
+"""
+Single-pass card extraction for the Metrograph films and events pages.
+
+Each card is walked once, depth first. Every element is dispatched on its
+tag to a short list of precompiled rules; the first element satisfying a
+rule claims that field, and the walk stops as soon as every field is
+claimed. Records are then built from the claimed nodes.
+"""
+
+import re
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, TypedDict
+
+from parsing import select_cards
+
+
+YEAR_DURATION_RE = re.compile(r'^\s*(\d{3,4})\s*/\s*(\d+)\s*min(?:\s*/.*)?$', re.IGNORECASE)
+
+
+class FilmRecord(TypedDict):
+    title: str
+    imageUrl: str
+    directors: List[str]
+    synopsis: str
+    year: int
+
+
+class EventRecord(TypedDict):
+    title: str
+    directors: str
+    description: str
+    time_date: str
+
+
+class Rule(NamedTuple):
+    """
+    How to claim one field of a card.
+
+    Attributes:
+        field: Name the matching node is stored under
+        tag: Tag name to match
+        class_: Class the node must carry, if any
+        within: Field whose node must be an ancestor, if any
+        string: Predicate on the node's only string, if any
+    """
+    field: str
+    tag: str
+    class_: Optional[str] = None
+    within: Optional[str] = None
+    string: Optional[Callable[[str], bool]] = None
+
+
+FILM_RULES = [
+    Rule("title", "h3", class_="movie_title"),
+    Rule("director", "h5", string=lambda t: "Director" in t),
+    Rule("year_duration", "h5", string=lambda t: YEAR_DURATION_RE.match(t.strip()) is not None),
+    Rule("synopsis", "p", class_="synopsis"),
+    Rule("image", "img"),
+]
+
+EVENT_RULES = [
+    Rule("heading", "h4"),
+    Rule("title", "a", class_="title", within="heading"),
+    Rule("metadata", "div", class_="film-metadata"),
+    Rule("description", "div", class_="film-description"),
+    Rule("showtimes", "div", class_="showtimes"),
+    Rule("showtime", "a", within="showtimes"),
+]
+
+
+def _index_rules(rules: List[Rule]) -> Dict[str, List[Rule]]:
+    """Group rules by tag for dispatch."""
+    by_tag: Dict[str, List[Rule]] = {}
+    for rule in rules:
+        by_tag.setdefault(rule.tag, []).append(rule)
+    return by_tag
+
+
+FILM_RULES_BY_TAG = _index_rules(FILM_RULES)
+EVENT_RULES_BY_TAG = _index_rules(EVENT_RULES)
+
+
+def match_fields(card, rules_by_tag: Dict[str, List[Rule]]) -> Dict:
+    """
+    Walk a card once and claim the first node matching each rule.
+
+    Args:
+        card: Card node from parsing.select_cards()
+        rules_by_tag: Rules grouped by tag (see _index_rules)
+
+    Returns:
+        Dict of field -> node for every field that was found
+    """
+    remaining = sum(len(rules) for rules in rules_by_tag.values())
+    found = {}
+
+    # Each entry carries the fields whose node is an ancestor of it
+    stack = [(child, frozenset()) for child in reversed(card.children())]
+    while stack and len(found) < remaining:
+        node, scope = stack.pop()
+
+        claimed = []
+        for rule in rules_by_tag.get(node.tag, ()):
+            if rule.field in found:
+                continue
+            if rule.within and rule.within not in scope:
+                continue
+            if rule.class_ and rule.class_ not in node.classes():
+                continue
+            if rule.string:
+                value = node.string()
+                if value is None or not rule.string(value):
+                    continue
+            found[rule.field] = node
+            claimed.append(rule.field)
+
+        if claimed:
+            scope = scope.union(claimed)
+        stack.extend((child, scope) for child in reversed(node.children()))
+
+    return found
+
+
+def extract_film(card) -> FilmRecord:
+    """
+    Build a film record from a films page card.
+
+    Args:
+        card: Card node from parsing.select_cards()
+
+    Returns:
+        The film record
+    """
+    fields = match_fields(card, FILM_RULES_BY_TAG)
+
+    title = fields["title"].text() if "title" in fields else ""
+
+    year_duration = fields.get("year_duration")
+    year = int(year_duration.text().split("/")[0].strip()) if year_duration else 0
+
+    if "director" in fields:
+        director_text = fields["director"].text().replace("Director:", "").strip()
+        directors = [name.strip() for name in director_text.split(",")]
+    else:
+        directors = []
+
+    # TODO switch synopsis with MORE... text and track Q&As
+    synopsis = fields["synopsis"].text() if "synopsis" in fields else ""
+    image_url = fields["image"].attr("src") if "image" in fields else ""
+
+    return {"title": title, "imageUrl": image_url, "directors": directors, "synopsis": synopsis, "year": year}
+
+
+def extract_event(card) -> EventRecord:
+    """
+    Build an event record from an events page card.
+
+    Args:
+        card: Card node from parsing.select_cards()
+
+    Returns:
+        The event record
+    """
+    fields = match_fields(card, EVENT_RULES_BY_TAG)
+
+    title = fields["title"].text() if "title" in fields else ""
+
+    # Metadata format: "Director Name / Year / Duration / Format"
+    directors = ""
+    if "metadata" in fields:
+        directors = fields["metadata"].text().split("/")[0].strip()
+
+    description = fields["description"].text() if "description" in fields else ""
+    time_date = fields["showtime"].text() if "showtime" in fields else ""
+
+    return {"title": title, "directors": directors, "description": description, "time_date": time_date}
+
+
+def iter_films(html: str, backend: Optional[str] = None) -> Iterator[FilmRecord]:
+    """
+    Yield a film record for every card on a films page.
+
+    Args:
+        html: Raw films page html
+        backend: Parser backend (see parsing.resolve_backend)
+    """
+    for card in select_cards(html, backend):
+        yield extract_film(card)
+
+
+def iter_events(html: str, backend: Optional[str] = None) -> Iterator[EventRecord]:
+    """
+    Yield an event record for every card on an events page.
+
+    Args:
+        html: Raw events page html
+        backend: Parser backend (see parsing.resolve_backend)
+    """
+    for card in select_cards(html, backend):
+        yield extract_event(card)
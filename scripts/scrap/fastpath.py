@@ -0,0 +1,117 @@
+"""
+HTTP fast path for Letterboxd film pages.
+
+Once a film's Letterboxd URL is known, its rating can be refreshed with
+a plain GET instead of a browser page load: the film page embeds its
+average rating in JSON-LD structured data. Anything unexpected (a
+challenge page, a missing or malformed rating) returns None so the
+caller can fall back to the browser.
+"""
+
+import json
+import re
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from driver import USER_AGENT
+from pacer import pace, record_response, OK, RATE_LIMITED, CHALLENGE, ERROR
+from cassette import attach, route
+
+
+FAST_PATH_TIMEOUT = 20  # seconds
+POOL_CONNECTIONS = 4  # kept-alive connections to letterboxd.com
+
+STRUCTURED_DATA_RE = re.compile(
+    r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE
+)
+CDATA_RE = re.compile(r"/\*\s*<!\[CDATA\[\s*\*/|/\*\s*\]\]>\s*\*/")
+
+
+def create_http_session() -> requests.Session:
+    """
+    Create a pooled HTTP session for film page requests.
+
+    Returns:
+        requests.Session that keeps connections alive between films
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_CONNECTIONS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Language": "en-US,en;q=0.9"
+    })
+    return attach(session)
+
+
+def parse_structured_rating(html: str) -> Optional[str]:
+    """
+    Read the average rating from a film page's JSON-LD.
+
+    Args:
+        html: Film page HTML
+
+    Returns:
+        Rating formatted like the page's visible rating (e.g. "3.6"),
+        or None if the page has no usable aggregateRating
+    """
+    for match in STRUCTURED_DATA_RE.finditer(html):
+        try:
+            data = json.loads(CDATA_RE.sub("", match.group(1)))
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(data, dict):
+            continue
+
+        aggregate = data.get("aggregateRating")
+        if not isinstance(aggregate, dict):
+            continue
+        try:
+            return f"{float(aggregate['ratingValue']):.1f}"
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+def fetch_rating(session: requests.Session, url: str, pacer: Dict[str, Any]) -> Optional[str]:
+    """
+    Fetch a film page over HTTP and extract its rating.
+
+    The request goes through the shared pacer, and its outcome is
+    reported back to it like a browser page load.
+
+    Args:
+        session: Session from create_http_session()
+        url: Letterboxd film page URL
+        pacer: Pacer state from create_pacer()
+
+    Returns:
+        Rating string, or None if the browser path should be used instead
+    """
+    pace(pacer, "Film page (HTTP)")
+    try:
+        response = session.get(route(url), timeout=FAST_PATH_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"⚠️  HTTP fast path failed for {url}: {type(e).__name__}")
+        record_response(pacer, ERROR)
+        return None
+
+    elapsed = response.elapsed.total_seconds()
+    if response.status_code == 429:
+        record_response(pacer, RATE_LIMITED, elapsed)
+        return None
+    if response.status_code in (403, 503):
+        # Cloudflare answers non-browsers with a challenge page
+        record_response(pacer, CHALLENGE, elapsed)
+        return None
+    record_response(pacer, OK, elapsed)
+
+    if response.status_code != 200:
+        print(f"⚠️  HTTP fast path got {response.status_code} for {url}")
+        return None
+    return parse_structured_rating(response.text)
@@ -0,0 +1,117 @@
+"""
+Freshness state for the Metrograph page fetches.
+
+Remembers each page's HTTP validators (ETag / Last-Modified) and content
+hashes between runs, so unchanged pages can be answered with a 304 and
+unchanged content can skip the parse and write stages.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict
+
+
+# File path
+FETCH_STATE_FILE = "./scripts/scrap/data/fetch_state.json"
+
+# Films and events may be fetched concurrently by the pipeline
+_save_lock = threading.Lock()
+
+
+def load_fetch_state(path: str = FETCH_STATE_FILE) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the saved fetch state.
+
+    Args:
+        path: State file location
+
+    Returns:
+        Dict of page name -> page state (empty if none saved yet)
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_fetch_state(state: Dict[str, Dict[str, Any]], path: str = FETCH_STATE_FILE) -> None:
+    """
+    Write the fetch state to disk atomically.
+
+    Args:
+        state: Dict of page name -> page state
+        path: State file location
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def save_page_state(page: str, page_state: Dict[str, Any], path: str = FETCH_STATE_FILE) -> None:
+    """
+    Update one page's entry in the saved fetch state.
+
+    Re-reads the file under a lock, so fetches of different pages running
+    at the same time never overwrite each other's state.
+
+    Args:
+        page: Page name (e.g. "films")
+        page_state: Saved state for that page
+        path: State file location
+    """
+    with _save_lock:
+        state = load_fetch_state(path)
+        state[page] = page_state
+        save_fetch_state(state, path)
+
+
+def conditional_headers(page_state: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Build If-None-Match / If-Modified-Since headers from saved validators.
+
+    Args:
+        page_state: Saved state for one page
+
+    Returns:
+        Headers dict (empty if no validators are known)
+    """
+    headers = {}
+    if page_state.get("etag"):
+        headers["If-None-Match"] = page_state["etag"]
+    if page_state.get("last_modified"):
+        headers["If-Modified-Since"] = page_state["last_modified"]
+    return headers
+
+
+def remember_validators(page_state: Dict[str, Any], headers, keep_missing: bool = False) -> None:
+    """
+    Store the validators from a response in the page state.
+
+    Args:
+        page_state: Saved state for one page (modified in place)
+        headers: Response headers
+        keep_missing: Keep saved validators the response does not repeat
+            (for 304 responses, which may omit them)
+    """
+    for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+        if headers.get(header) or not keep_missing:
+            page_state[key] = headers.get(header)
+
+
+def content_hash(content: Any) -> str:
+    """
+    Hash page text or parsed records.
+
+    Args:
+        content: A string, or any JSON-serializable value
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    if not isinstance(content, str):
+        content = json.dumps(content, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -1,10 +1,48 @@
 import requests
-from bs4 import BeautifulSoup
 import json
 import csv
-import re
+import os
 import time
-from seleniumbase import Driver
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+
+from extract import iter_films, iter_events
+from parsing import CARD_CLASS
+from readiness import wait_until_ready
+from driver import create_driver
+from helpers import is_ci_environment
+from spans import span, start_run, print_span_summary
+from cassette import route, attach, record_page, isolate
+from showtimes import add_start_times
+from fetch_state import (
+    load_fetch_state, save_page_state, conditional_headers,
+    remember_validators, content_hash
+)
+
+FILMS_URL = "https://metrograph.com/film/"
+EVENTS_URL = "https://metrograph.com/events/"
+
+REQUEST_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+
+def create_metrograph_session() -> requests.Session:
+    """
+    Create a keep-alive session shared by the films and events fetches.
+
+    Returns:
+        requests.Session with room for both pages' connections
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(REQUEST_HEADERS)
+    return attach(session)
 
 
 def _cache_busted_url(base_url: str) -> str:
@@ -20,79 +58,123 @@ def _log_freshness_headers(prefix: str, headers):
         f"Cache-Control: {headers.get('Cache-Control')}"
     )
 
-def get_metrograph_films(isLocal: bool):
+
+def _is_unchanged_html(page_state: dict, html: str) -> bool:
+    """Record the page's html hash and report whether it matches the last run."""
+    html_hash = content_hash(html)
+    unchanged = page_state.get("html_hash") == html_hash
+    page_state["html_hash"] = html_hash
+    return unchanged
+
+
+def _is_unchanged_records(page_state: dict, records: list) -> bool:
+    """Record the parsed records' hash and report whether it matches the last run."""
+    records_hash = content_hash(records)
+    unchanged = page_state.get("records_hash") == records_hash
+    page_state["records_hash"] = records_hash
+    return unchanged
+
+
+def get_metrograph_films(isLocal: bool, session: Optional[requests.Session] = None) -> Optional[list]:
+    """
+    Pull and parse the Metrograph films page into raw_films.json.
+
+    When not local, sends a conditional request using the validators from
+    the last run and skips parsing and writing if the page or its parsed
+    films are unchanged.
+
+    Args:
+        isLocal: Read the saved html instead of fetching
+        session: Session to fetch with (a new one if None)
+
+    Returns:
+        The parsed films if raw_films.json was rewritten, None if nothing
+        changed
+    """
+    page_state = load_fetch_state().get("films", {})
+
     if isLocal:
         print("0️⃣ Pulling films from local file")
         # pull raw html from local file
         with open("./scripts/scrap/data/metrograph.html", "r", encoding="utf-8") as f:
-            response = f.read()
+            html_content = f.read()
     else:
         print("0️⃣ Pulling films from Metrograph website, films page")
 
-        # pull raw html with cache-busting headers
-        headers = {
-            'Cache-Control': 'no-cache, no-store, must-revalidate',
-            'Pragma': 'no-cache',
-            'Expires': '0',
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        film_url = _cache_busted_url("https://metrograph.com/film/")
-        response = requests.get(film_url, headers=headers, timeout=30)
+        # revalidate against the origin using last run's validators
+        session = session or create_metrograph_session()
+        with span("films_fetch") as attrs:
+            response = session.get(route(FILMS_URL), headers=conditional_headers(page_state), timeout=30)
+            attrs["status"] = response.status_code
         response.raise_for_status()
         _log_freshness_headers("Film page", response.headers)
-        with open("./scripts/scrap/data/metrograph.html", "w", encoding="utf-8") as f:
-            f.write(response.text)
-        
-    print("1️⃣ Successfully pulled metrograph films html")
 
-    soup_response = response if isLocal else response.text
-    soup = BeautifulSoup(soup_response, "html.parser")
-    films = soup.find_all("div", class_="homepage-in-theater-movie")
+        if response.status_code == 304:
+            print("✅ Film page not modified since last run, skipping parse")
+            return None
+
+        remember_validators(page_state, response.headers)
+        html_content = response.text
 
-    parsed_films = []
+        if _is_unchanged_html(page_state, html_content):
+            save_page_state("films", page_state)
+            print("✅ Film page content unchanged since last run, skipping parse")
+            return None
+        
+    print("1️⃣ Successfully pulled metrograph films html")
 
     print("2️⃣ Start parsing html")
 
     # parse raw information into list of films
-    for film in films:
-        # print(film)
-        raw_title = film.find("h3", class_="movie_title")
-        title = raw_title.get_text(strip=True) if raw_title else ""
-
-        raw_director = film.find("h5", string=lambda t: t and "Director" in t)
-
-        pattern = re.compile(r'^\s*(\d{3,4})\s*/\s*(\d+)\s*min(?:\s*/.*)?$', re.IGNORECASE)
-        raw_year_duration = film.find(
-            "h5",
-            string=lambda t: isinstance(t, str) and pattern.match(t.strip())
-        )
-        year = int(raw_year_duration.get_text(strip=True).split("/")[0].strip()) if raw_year_duration else 0
-
-        if raw_director:
-            director_text = raw_director.get_text(strip=True).replace("Director:", "").strip()
-            directors = [name.strip() for name in director_text.split(",")]
-        else:
-            directors = []
-
-        # TODO switch synopsis with MORE... text and track Q&As
-        raw_synopsis = film.find("p", class_="synopsis")
-        synopsis = raw_synopsis.get_text(strip=True) if raw_synopsis else ""
-
-        raw_img = film.find("img")
-        imageUrl = raw_img.attrs.get("src", "") if raw_img else ""
-
-        parsed_films.append({"title": title, "imageUrl": imageUrl, "directors": directors, "synopsis": synopsis, "year": year })
+    with span("films_parse") as attrs:
+        parsed_films = list(iter_films(html_content))
+        attrs["records"] = len(parsed_films)
     
     print("2️⃣ Finish parsing html")
 
+    if not isLocal:
+        unchanged = _is_unchanged_records(page_state, parsed_films)
+        save_page_state("films", page_state)
+        if unchanged:
+            print("✅ Parsed films unchanged since last run, skipping write")
+            return None
+
+        with open("./scripts/scrap/data/metrograph.html", "w", encoding="utf-8") as f:
+            f.write(html_content)
+
     # add metrograph html to file for local storage 
     with open("./scripts/scrap/data/raw_films.json", "w", encoding="utf-8") as f:
         json.dump(parsed_films, f, ensure_ascii=False, indent=2)
     
     print("3️⃣ Finish writing html to file")
+    return parsed_films
+
+def get_metrograph_events(
+    isLocal: bool,
+    driver=None,
+    session: Optional[requests.Session] = None
+) -> Optional[list]:
+    """
+    Pull and parse the Metrograph events page into raw_events.json.
+
+    The page is rendered in Chrome because its showtimes load through
+    JavaScript. Its freshness headers come from a conditional HEAD
+    request (no body is downloaded twice), and a 304 is only logged; the
+    rendered html and parsed events are hashed to skip parsing and
+    writing when nothing changed.
+
+    Args:
+        isLocal: Read the saved html instead of fetching
+        driver: Browser session to render with; it is left open for the
+            caller. If None, one is created and quit here.
+        session: Session for the HEAD probe (a new one if None)
+
+    Returns:
+        The parsed events if raw_events.json was rewritten, None if
+        nothing changed
+    """
+    page_state = load_fetch_state().get("events", {})
 
-def get_metrograph_events(isLocal: bool):
-    
     if isLocal:
         print("0️⃣ Opening local metrograph events html file")
         # pull raw html from local file
@@ -100,30 +182,28 @@ def get_metrograph_events(isLocal: bool):
             html_content = f.read()
     else:
         print("0️⃣ Pulling from Metrograph website, events page (using Selenium)")
-        events_url = _cache_busted_url("https://metrograph.com/events/")
+        events_url = _cache_busted_url(EVENTS_URL)
 
         # Log origin freshness headers before browser fetch for observability.
-        events_headers_response = requests.get(
-            events_url,
-            headers={
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0",
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            },
-            timeout=30,
-        )
+        # HEAD, so the page body is only downloaded by the browser.
+        session = session or create_metrograph_session()
+        with span("events_probe") as attrs:
+            events_headers_response = session.head(
+                route(EVENTS_URL), headers=conditional_headers(page_state), timeout=30
+            )
+            attrs["status"] = events_headers_response.status_code
         events_headers_response.raise_for_status()
         _log_freshness_headers("Events page", events_headers_response.headers)
+        if events_headers_response.status_code == 304:
+            print("ℹ️  Events page not modified per validators, checking rendered content")
+        else:
+            remember_validators(page_state, events_headers_response.headers)
 
         # Use Selenium to load the page so JavaScript can execute
-        driver = Driver(
-            browser="chrome",
-            uc=True,
-            headless2=False,  # Set to True for GitHub Actions
-            incognito=True,
-            undetectable=True
-        )
+        owns_driver = driver is None
+        if owns_driver:
+            with span("browser_launch"):
+                driver = create_driver(is_ci_environment())
         
         try:
             try:
@@ -132,73 +212,101 @@ def get_metrograph_events(isLocal: bool):
             except Exception as e:
                 print(f"⚠️ Could not disable Chrome cache via CDP: {e}")
 
-            driver.get(events_url)
-            time.sleep(10)  # Wait for JavaScript to load dynamic content
-            html_content = driver.page_source
-            
-            with open("./scripts/scrap/data/metrograph_events.html", "w", encoding="utf-8") as f:
-                f.write(html_content)
+            with span("events_render"):
+                driver.get(route(events_url))
+                # Wait for JavaScript to finish rendering the event cards
+                wait_until_ready(driver, f"div.{CARD_CLASS}", label="Events page")
+                html_content = driver.page_source
+                record_page(driver, events_url)
         finally:
-            driver.quit()
+            if owns_driver:
+                driver.quit()
+            else:
+                # Hand the session back with its normal caching
+                try:
+                    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+                except Exception:
+                    pass
+
+        if _is_unchanged_html(page_state, html_content):
+            save_page_state("events", page_state)
+            print("✅ Events page content unchanged since last run, skipping parse")
+            return None
         
     print("1️⃣ Successfully pulled metrograph events html")
 
-    # Use BeautifulSoup to parse the HTML
-    soup = BeautifulSoup(html_content, "html.parser")
-    events = soup.find_all("div", class_="homepage-in-theater-movie")
-
     parsed_events = []
 
     print("2️⃣ Start parsing events html")
 
     # parse raw information into list of events
-    for event in events:
-        # Extract title
-        title_tag = event.find("h4")
-        if title_tag:
-            title_link = title_tag.find("a", class_="title")
-            title = title_link.get_text(strip=True) if title_link else ""
-        else:
-            title = ""
-
-        # Extract director from metadata (format: "Director Name / Year / Duration / Format")
-        metadata_tag = event.find("div", class_="film-metadata")
-        directors = ""
-        if metadata_tag:
-            metadata_text = metadata_tag.get_text(strip=True)
-            # Split by "/" and take the first part as director
-            parts = metadata_text.split("/")
-            if parts:
-                directors = parts[0].strip()
-
-        # Extract description
-        description_tag = event.find("div", class_="film-description")
-        description = description_tag.get_text(strip=True) if description_tag else ""
-
-        # Extract time and date
-        showtimes_tag = event.find("div", class_="showtimes")
-        time_date = ""
-        if showtimes_tag:
-            showtime_link = showtimes_tag.find("a")
-            if showtime_link:
-                time_date = showtime_link.get_text(strip=True)
-
-        parsed_events.append({
-            "title": title,
-            "directors": directors,
-            "description": description,
-            "time_date": time_date
-        })
-
-        print(f"→ Parsed event: {title}")
+    with span("events_parse") as attrs:
+        for event in iter_events(html_content):
+            parsed_events.append(event)
+            print(f"→ Parsed event: {event['title']}")
+        # Showtimes have no year; resolve them against the fetch time once, here
+        add_start_times(parsed_events)
+        attrs["records"] = len(parsed_events)
 
     print(f"2️⃣ Finish parsing events html - Found {len(parsed_events)} events")
 
+    if not isLocal:
+        unchanged = _is_unchanged_records(page_state, parsed_events)
+        save_page_state("events", page_state)
+        if unchanged:
+            print("✅ Parsed events unchanged since last run, skipping write")
+            return None
+
+        with open("./scripts/scrap/data/metrograph_events.html", "w", encoding="utf-8") as f:
+            f.write(html_content)
+
     # Write events to file
     with open("./scripts/scrap/data/raw_events.json", "w", encoding="utf-8") as f:
         json.dump(parsed_events, f, ensure_ascii=False, indent=2)
     
     print("3️⃣ Finish writing events to file")
-
-get_metrograph_films(False)
-get_metrograph_events(False)
\ No newline at end of file
+    return parsed_events
+
+
+def fetch_metrograph_pages(isLocal: bool, driver=None) -> Tuple[Optional[list], Optional[list]]:
+    """
+    Fetch the films and events pages concurrently over one session.
+
+    Args:
+        isLocal: Read the saved html instead of fetching
+        driver: Browser session for the events page (see get_metrograph_events)
+
+    Returns:
+        Tuple of (films, events), each None if unchanged
+    """
+    start = time.monotonic()
+    session = create_metrograph_session()
+    try:
+        with span("metrograph_fetch"):
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="metrograph") as executor:
+                films = executor.submit(get_metrograph_films, isLocal, session)
+                events = executor.submit(get_metrograph_events, isLocal, driver, session)
+                result = films.result(), events.result()
+    finally:
+        session.close()
+    print(f"⏱️  Metrograph pages fetched in {time.monotonic() - start:.1f}s")
+    return result
+
+
+def _report_changed(changed: bool) -> None:
+    """Expose whether any raw file changed to later GitHub Actions steps."""
+    print(f"📣 Raw data {'changed' if changed else 'unchanged'} since last run")
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, "a", encoding="utf-8") as f:
+            f.write(f"changed={'true' if changed else 'false'}\n")
+
+
+if __name__ == "__main__":
+    isolate()
+    start_run()
+    try:
+        films, events = fetch_metrograph_pages(False)
+        _report_changed(films is not None or events is not None)
+    finally:
+        print_span_summary()
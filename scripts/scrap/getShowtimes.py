@@ -7,8 +7,11 @@ and combines the data with event information.
 
 import json
 import csv
+import os
 import re
-from datetime import datetime
+import signal
+import threading
+import time
 from urllib.parse import quote_plus
 
 from selenium.webdriver.common.by import By
@@ -17,11 +20,25 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
 # Local modules
-from helpers import is_ci_environment, wait_for_delay
-from debug import save_screenshot, save_debug_info
-from progress import save_progress, create_save_state
-from driver import create_driver, RESTART_EVERY_N_FILMS
-from cloudflare import solve_challenge
+from helpers import is_ci_environment
+from debug import save_screenshot, save_debug_info, flush_captures, SUCCESS_SAMPLE_RATE
+from progress import open_progress, record_film, load_processed_titles, load_films, export_progress, DEFERRED
+from driver import create_driver
+from recycle import record_page_load, forget_session, session_pressure
+from cloudflare import solve_challenge, detect_block, CONTENT_LOADED_SELECTOR, TURNSTILE_IFRAME_SELECTOR
+from readiness import wait_until_ready
+from pacer import create_pacer, pace, record_response, print_pacer_summary, OK, ERROR
+from cache import load_rating_cache, save_rating_cache, get_fresh_rating, get_known_url, store_rating
+from resolution import load_url_index, save_url_index, resolve_url, remember_url, forget_url
+from output import write_films_output
+from join import join_events
+from posters import load_poster_manifest, apply_posters
+from showtimes import event_start
+from fastpath import create_http_session, fetch_rating
+from spans import span, start_run, print_span_summary
+from cassette import route, original_url, record_page, isolate
+from pool import start_pool, submit, iter_results, close_pool, SCRAPER_WORKERS, DONE, SKIPPED
+from schedule import create_schedule, prioritize, may_start, record_duration, print_schedule
 
 
 # Phrases that indicate a non-film entry to skip
@@ -41,84 +58,110 @@ SKIP_PHRASES = [
     "dcp"
 ]
 
+# Point at a local stand-in (see standin.py) to run offline
+LETTERBOXD_BASE_URL = os.environ.get("LETTERBOXD_BASE_URL", "https://letterboxd.com").rstrip("/")
 
-def add_events_to_films():
+# Either the expected content or a challenge to solve means the page is ready
+SEARCH_READY_SELECTOR = f"{CONTENT_LOADED_SELECTOR}, {TURNSTILE_IFRAME_SELECTOR}"
+FILM_READY_SELECTOR = f"span.average-rating, {SEARCH_READY_SELECTOR}"
+LETTERBOXD_READY_TIMEOUT = 15  # seconds
+
+BROWSER_STARTUP_ESTIMATE = 15  # seconds per undetected-Chrome launch, for the plan
+HTTP_LOOKUP_ESTIMATE = 5  # seconds per fast-path refresh before one is measured
+
+
+def add_events_to_films(films: list = None, events: list = None):
     """
     Merge event data from raw_events.json with parsed film data.
     
-    Reads the parsed films CSV and events JSON, matches by title,
-    and writes the combined data to the final output CSV.
+    Reads the parsed films CSV and events JSON, matches events to films
+    through the join index (see join.py), and writes the combined data
+    to the final output CSV. Each film gets all of its events as JSON in
+    the events column; the event_* columns hold its most confident,
+    earliest one. Posters are pointed at their local variants. The
+    output and meta.json are only rewritten when the combined data
+    changed.
+    
+    Args:
+        films: Rated films, instead of reading parsed_films.csv
+        events: Parsed events, instead of reading raw_events.json
     """
     print("0️⃣ Adding events to parsed films")
 
     # Read films from CSV
-    with open("./scripts/scrap/data/parsed_films.csv", "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        parsed_films = list(reader)
+    if films is not None:
+        parsed_films = [dict(film) for film in films]
+    else:
+        with open("./scripts/scrap/data/parsed_films.csv", "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            parsed_films = list(reader)
 
     # Read events from JSON
-    with open("./scripts/scrap/data/raw_events.json", "r", encoding="utf-8") as f:
-        raw_events = json.load(f)
+    if events is not None:
+        raw_events = events
+    else:
+        with open("./scripts/scrap/data/raw_events.json", "r", encoding="utf-8") as f:
+            raw_events = json.load(f)
     
-    # Create lookup dict for O(1) matching
-    films_by_title = {film["title"]: film for film in parsed_films}
+    # One row per title
+    films_with_events = list({film["title"]: film for film in parsed_films}.values())
     
     # Add event data to matching films
-    for event in raw_events:
-        if event["title"] in films_by_title:
-            films_by_title[event["title"]]["event_description"] = event["description"]
-            films_by_title[event["title"]]["event_time_date"] = event["time_date"]
+    for film, events in zip(films_with_events, join_events(films_with_events, raw_events)):
+        if not events:
+            continue
+        best = max(events, key=lambda event: event["match_confidence"])
+        film["event_description"] = best["description"]
+        film["event_time_date"] = best["time_date"]
+        for event in events:
+            # raw_events.json from before start times were parsed has none
+            start = event_start(event)
+            event["starts_at"] = start.isoformat() if start else ""
+        film["event_starts_at"] = best["starts_at"]
+        film["events"] = json.dumps([
+            {key: event[key] for key in ("title", "description", "time_date", "starts_at", "match_confidence")}
+            for event in events
+        ], ensure_ascii=False)
         
     print("1️⃣ Successfully added events to parsed films")
 
+    # Serve posters prefetched by posters.py instead of hot-linking them
+    apply_posters(films_with_events, load_poster_manifest())
+
     # Write final output
-    films_with_events = list(films_by_title.values())
+    for film in films_with_events:
+        film.setdefault("event_description", "")
+        film.setdefault("event_time_date", "")
+        film.setdefault("event_starts_at", "")
+        film.setdefault("letterboxd_url", "")
+        film.setdefault("events", "")
     
-    fieldnames = [
-        "title", "imageUrl", "directors", "synopsis", "year", 
-        "rating", "letterboxd_url", "event_description", "event_time_date"
-    ]
-    
-    with open("./src/lib/data/films.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for film in films_with_events:
-            film.setdefault("event_description", "")
-            film.setdefault("event_time_date", "")
-            film.setdefault("letterboxd_url", "")
-            writer.writerow(film)
-
-    with open("./src/lib/data/meta.json", "w", encoding="utf-8") as f:
-        json.dump({"lastUpdated": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")}, f)
+    write_films_output(films_with_events)
     
     print("2️⃣ Finish writing events to file")
 
 
-def _load_already_processed() -> set:
-    """Load titles of films already processed from progress files."""
-    already_processed = set()
-    
-    # Load parsed films
-    try:
-        with open("./scripts/scrap/data/parsed_films_progress.csv", "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            already_processed = {row["title"] for row in reader}
-        print(f"📂 Found existing progress: {len(already_processed)} films already processed")
-    except FileNotFoundError:
-        print("📂 No existing progress found, starting fresh")
+def _load_already_processed(progress) -> set:
+    """Load titles of films already processed from the progress database."""
+    already_done = load_processed_titles(progress, DONE)
+    already_skipped = load_processed_titles(progress, SKIPPED)
     
-    # Load skipped films
-    try:
-        with open("./scripts/scrap/data/skipped_films_progress.csv", "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            already_skipped = {row["title"] for row in reader}
-            already_processed.update(already_skipped)
+    if already_done or already_skipped:
+        print(f"📂 Found existing progress: {len(already_done)} films already processed")
         print(f"📂 Found {len(already_skipped)} previously skipped films")
-    except FileNotFoundError:
-        pass
+    else:
+        print("📂 No existing progress found, starting fresh")
     
-    return already_processed
+    return already_done | already_skipped
+
+
+def _exit_on_signal(signum, frame) -> None:
+    """Turn SIGTERM/SIGINT into SystemExit so the final save still runs."""
+    # Ignore repeats so a second signal cannot cut the final save short
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    print(f"🛑 Received {signal.Signals(signum).name}, saving progress before exit")
+    raise SystemExit(128 + signum)
 
 
 def _should_skip_film(film: dict, film_title: str) -> tuple[bool, str]:
@@ -142,56 +185,88 @@ def _should_skip_film(film: dict, film_title: str) -> tuple[bool, str]:
     return False, ""
 
 
-def _scrape_film_from_letterboxd(driver, film: dict, film_title: str, is_ci: bool) -> bool:
+def _load_letterboxd_page(driver, pacer: dict, url: str, ready_selector: str, label: str) -> None:
+    """
+    Load a Letterboxd page under the pacer and report the outcome back to it.
+    
+    Args:
+        driver: SeleniumBase driver instance
+        pacer: Pacer state from create_pacer()
+        url: Page to load
+        ready_selector: Selector that means the page has rendered
+        label: Page name for log lines
+    """
+    with span("pacer_wait", page=label):
+        pace(pacer, label)
+    start = time.monotonic()
+    with span("page_load", page=label):
+        driver.get(route(url))
+        wait_until_ready(driver, ready_selector, label=label, timeout=LETTERBOXD_READY_TIMEOUT)
+    elapsed = time.monotonic() - start
+    record_page_load(driver, elapsed)
+    record_response(pacer, detect_block(driver) or OK, elapsed)
+
+
+def _scrape_film_from_letterboxd(driver, film: dict, film_title: str, is_ci: bool, pacer: dict) -> bool:
     """
     Scrape a single film's rating from Letterboxd.
     
+    Goes straight to the film page when film["letterboxd_url"] is
+    already set, otherwise finds it through the search page first.
+    
     Args:
         driver: SeleniumBase driver instance
         film: Film dict to update with rating/url
         film_title: Cleaned film title for search
         is_ci: Whether running in CI (headless) mode
+        pacer: Pacer state from create_pacer()
     
     Returns:
         True if successful, False if failed
     """
     print(f"→ Start parsing {film_title}")
-    
-    # Search for film on Letterboxd
-    search_url = "https://letterboxd.com/search/" + quote_plus(f"{film_title} {film['year']}")
-    driver.get(search_url)
-    
-    # Save screenshot for debugging
-    save_screenshot(driver, film_title)
-    
     wait = WebDriverWait(driver, 20)
-    wait_for_delay()
-    solve_challenge(driver, is_headless=is_ci)
     
-    # Find the first film result
-    link_tag = wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "h2.headline-2 span.film-title-wrapper a")
-        )
-    )
+    film_url = film.get("letterboxd_url")
+    if film_url:
+        print(f"→ Using known film url: {film_url}")
+    else:
+        # Search for film on Letterboxd
+        search_url = f"{LETTERBOXD_BASE_URL}/search/" + quote_plus(f"{film_title} {film['year']}")
+        _load_letterboxd_page(driver, pacer, search_url, SEARCH_READY_SELECTOR, "Search page")
+        
+        with span("solve_challenge", page="Search page"):
+            solve_challenge(driver, is_headless=is_ci)
+        # Recorded past the challenge, so replays get the results, not the interstitial
+        record_page(driver, search_url, detect_block(driver))
+        
+        # Find the first film result
+        with span("search_result_wait"):
+            link_tag = wait.until(
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, "h2.headline-2 span.film-title-wrapper a")
+                )
+            )
+        film_url = original_url(link_tag.get_attribute("href"))
+        film["letterboxd_url"] = film_url
+        print(f"→ Found film url: {film_url}")
     
     # Navigate to film page
-    film_url = link_tag.get_attribute("href")
-    film["letterboxd_url"] = film_url
-    print(f"→ Found film url: {film_url}")
     
     print(f"→ Loading film page...")
-    driver.get(film_url)
+    _load_letterboxd_page(driver, pacer, film_url, FILM_READY_SELECTOR, "Film page")
     print(f"→ Film page loaded")
     
-    wait_for_delay()
-    solve_challenge(driver, is_headless=is_ci)
+    with span("solve_challenge", page="Film page"):
+        solve_challenge(driver, is_headless=is_ci)
+    record_page(driver, film_url, detect_block(driver))
     
     # Get rating
     print(f"→ Waiting for rating element...")
-    rating = wait.until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, "span.average-rating > a"))
-    )
+    with span("rating_wait"):
+        rating = wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "span.average-rating > a"))
+        )
     print(f"→ Rating element found")
     film["rating"] = rating.text
     
@@ -199,19 +274,178 @@ def _scrape_film_from_letterboxd(driver, film: dict, film_title: str, is_ci: boo
     return True
 
 
-def parse_letterboxd():
+def _clean_title(title: str) -> str:
+    """Strip punctuation from a title for searching and log lines."""
+    return re.sub(r"[^\w\s]", "", title)
+
+
+def _launch_driver(is_ci: bool):
+    """Start a browser session, timed as a browser_launch span."""
+    with span("browser_launch"):
+        return create_driver(is_ci)
+
+
+def _quit_driver(driver) -> None:
+    """Close a browser session and drop its recycling stats."""
+    with span("browser_quit"):
+        forget_session(driver)
+        driver.quit()
+
+
+def _scrape_task(driver, film: dict, is_ci: bool, pacer: dict) -> tuple[str, str]:
+    """
+    Worker-pool scrape function: look up one film, turning failures into skips.
+    
+    Returns:
+        Tuple of (DONE or SKIPPED, reason)
+    """
+    film_title = _clean_title(film["title"])
+    with span("browser_lookup", film=film["title"]) as attrs:
+        try:
+            _scrape_film_from_letterboxd(driver, film, film_title, is_ci, pacer)
+            attrs["outcome"] = DONE
+            # Keep a sample of good pages to compare failures against
+            with span("screenshot"):
+                save_screenshot(driver, film_title, sample_rate=SUCCESS_SAMPLE_RATE)
+            return DONE, ""
+        except TimeoutException:
+            reason = "timeout"
+        except WebDriverException:
+            reason = "webdriver error"
+        except Exception as e:
+            reason = f"error: {type(e).__name__}"
+        
+        attrs["outcome"] = reason
+        # Page loads were already reported to the pacer; only a block still on
+        # screen or a browser/network error says anything more about server load.
+        # A film missing from Letterboxd or a page without a rating does not.
+        block = detect_block(driver)
+        if block:
+            record_response(pacer, block)
+        elif reason == "webdriver error":
+            record_response(pacer, ERROR)
+        with span("debug_capture"):
+            save_debug_info(driver, film_title)
+        return SKIPPED, reason
+
+
+def _print_source_summary(sources: dict) -> None:
+    """Log the share of films served by each rating path."""
+    total = sum(sources.values())
+    if not total:
+        return
+    shares = ", ".join(
+        f"{count} {path} ({count / total:.0%})" for path, count in sources.items()
+    )
+    print(f"📊 Ratings served by: {shares}")
+
+
+def _plan_films(films: list, rating_cache: dict, url_index: dict) -> dict:
+    """
+    Classify every remaining film before any browser exists.
+    
+    Returns:
+        Dict of plan step -> list of entries:
+        'skip': (film, reason), 'cached': (film, cache entry),
+        'refresh': (film, known URL) and 'fetch': film
+    """
+    plan = {"skip": [], "cached": [], "refresh": [], "fetch": []}
+    
+    for film in films:
+        should_skip, reason = _should_skip_film(film, _clean_title(film["title"]))
+        if should_skip:
+            plan["skip"].append((film, reason))
+            continue
+        
+        known_url = resolve_url(url_index, film) or get_known_url(rating_cache, film)
+        cached = get_fresh_rating(rating_cache, film)
+        if cached and known_url and cached["letterboxd_url"] != known_url:
+            # Resolved to another page since, e.g. by a manual override
+            cached = None
+        
+        if cached:
+            plan["cached"].append((film, cached))
+        elif known_url:
+            plan["refresh"].append((film, known_url))
+        else:
+            plan["fetch"].append(film)
+    
+    return plan
+
+
+def _print_plan(plan: dict, pacer: dict, workers: int) -> None:
+    """Log the plan and a pacer-bound estimate of how long it will take."""
+    # Page loads are paced globally, so the estimate is requests x interval
+    requests = len(plan["refresh"]) + 2 * len(plan["fetch"])
+    sessions = min(workers, len(plan["fetch"]))
+    estimate = requests * pacer["interval"] + sessions * BROWSER_STARTUP_ESTIMATE
+    
+    print(
+        f"🗺️  Plan: {len(plan['skip'])} skip, {len(plan['cached'])} cached, "
+        f"{len(plan['refresh'])} refresh over HTTP, {len(plan['fetch'])} search in browser"
+    )
+    print(
+        f"🗺️  ~{requests} Letterboxd requests, {sessions} browser session(s), "
+        f"estimated {estimate / 60:.1f} min (excluding fallbacks and challenges)"
+    )
+
+
+def _load_events(events: list = None) -> list:
+    """Parsed events for prioritizing, from raw_events.json unless given."""
+    if events is not None:
+        return events
+    try:
+        with open("./scripts/scrap/data/raw_events.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def parse_letterboxd(films: list = None, driver=None, events: list = None) -> list:
     """
     Main scraping function.
     
     Loads films from raw_films.json, scrapes Letterboxd for ratings,
-    and saves progress incrementally.
+    and saves progress incrementally. Films with a fresh entry in the
+    rating cache are served from it without loading Letterboxd; the rest
+    are looked up by SCRAPER_WORKERS browser sessions under one shared
+    pacer, with this thread as the only writer of progress. Each film is
+    committed to the progress database as soon as it finishes, and
+    SIGTERM/SIGINT still run the final save.
+    Films whose Letterboxd URL is already known (from the URL index, a
+    manual override or an earlier cached rating) skip the search page:
+    they are first refreshed with a plain HTTP request, falling back to
+    the browser's film page load only if that fails.
+    
+    Every film is classified up front, and browser sessions are only
+    launched for, and at most as many as, the films that need one.
+    Lookups run most valuable first (see schedule.py), and with
+    SCRAPER_DEADLINE_SECONDS set, no lookup starts that would not finish
+    before the deadline; those films are left for the next run.
+    
+    Args:
+        films: Films to rate, instead of reading raw_films.json
+        driver: An open browser session to reuse as the first worker's;
+            it is quit by the time this returns
+        events: Parsed events used to prioritize films, instead of
+            reading raw_events.json
+    
+    Returns:
+        All rated films recorded in the progress database
     """
     # Load input data
-    with open("./scripts/scrap/data/raw_films.json", "r", encoding="utf-8") as f:
-        parsed_films = json.load(f)
+    if films is not None:
+        parsed_films = films
+    else:
+        with open("./scripts/scrap/data/raw_films.json", "r", encoding="utf-8") as f:
+            parsed_films = json.load(f)
+    
+    # A session handed over by the caller is used before launching new ones
+    handoff = [driver] if driver is not None else []
 
     # Check for existing progress
-    already_processed = _load_already_processed()
+    progress = open_progress()
+    already_processed = _load_already_processed(progress)
     
     # Filter to unprocessed films
     films_to_process = [
@@ -223,83 +457,187 @@ def parse_letterboxd():
     
     if not films_to_process:
         print("✅ All films already processed!")
-        return
+        for spare in handoff:
+            _quit_driver(spare)
+        export_progress(progress)
+        rated_films = load_films(progress, DONE)
+        progress.close()
+        return rated_films
+
+    rating_cache = load_rating_cache()
+    url_index = load_url_index()
 
-    # Set up browser
+    pacer = create_pacer()
+    with span("plan", films=len(films_to_process)):
+        plan = _plan_films(films_to_process, rating_cache, url_index)
+        # Most valuable lookups first, so a short run spends its time on them
+        raw_events = _load_events(events)
+        plan["fetch"] = prioritize(plan["fetch"], rating_cache, raw_events)
+        known_urls = {id(film): url for film, url in plan["refresh"]}
+        plan["refresh"] = [
+            (film, known_urls[id(film)])
+            for film in prioritize([film for film, _ in plan["refresh"]], rating_cache, raw_events)
+        ]
+    _print_plan(plan, pacer, SCRAPER_WORKERS)
+    
+    schedule = create_schedule()
+    print_schedule([film for film, _ in plan["refresh"]] + plan["fetch"], schedule)
+    # Before any lookup is measured, assume a browser search costs two paced page loads and a launch
+    browser_estimate = 2 * pacer["interval"] + BROWSER_STARTUP_ESTIMATE
+    http_estimate = pacer["interval"] + HTTP_LOOKUP_ESTIMATE
+    
     is_ci = is_ci_environment()
-    print(f"🖥️  Running in {'CI/headless' if is_ci else 'local/visible'} mode")
+    http_session = create_http_session() if plan["refresh"] else None
+    pool = None
+    
+    def scrape(driver, film: dict) -> tuple[str, str]:
+        """Worker scrape function, timing lookups for the schedule."""
+        start = time.monotonic()
+        result = _scrape_task(driver, film, is_ci, pacer)
+        record_duration(schedule, "browser", time.monotonic() - start)
+        return result
     
-    driver = create_driver(is_ci)
-    films_since_restart = 0
+    def submit_to_browser(film: dict) -> None:
+        """Queue a film for the browser pool, starting the pool on first use."""
+        nonlocal pool
+        if pool is None:
+            # Each worker launches its own browser on its first film
+            print(f"🖥️  Running in {'CI/headless' if is_ci else 'local/visible'} mode")
+            pool = start_pool(
+                min(SCRAPER_WORKERS, len(plan["fetch"]) + len(plan["refresh"])),
+                session_factory=lambda: handoff.pop() if handoff else _launch_driver(is_ci),
+                scrape=scrape,
+                close_session=_quit_driver,
+                check_session=session_pressure,
+                admit=lambda film: may_start(schedule, "browser", browser_estimate)
+            )
+        submit(pool, film)
     
     # Track results
-    done_films = []
-    skipped_films = []
-    save_state = create_save_state(len(already_processed))
+    recorded = 0
+    deferred = 0
+    sources = {"cache": 0, "http": 0, "browser": 0}
+
+    def record(film: dict, status: str, message: str) -> None:
+        """Single writer: commit a result and save the caches periodically."""
+        nonlocal recorded
+        record_film(progress, film, status)
+        print(message)
+        
+        recorded += 1
+        if recorded % 10 == 0:
+            save_rating_cache(rating_cache)
+            save_url_index(url_index)
+
+    def record_pool_results(block: bool, deadline: float = None) -> None:
+        """Write out lookups the workers have finished."""
+        nonlocal deferred
+        if pool is None:
+            return
+        for film, status, reason in iter_results(pool, block=block, deadline=deadline):
+            film_title = _clean_title(film["title"])
+            if status == DEFERRED:
+                deferred += 1
+            elif status == DONE:
+                sources["browser"] += 1
+                store_rating(rating_cache, film)
+                remember_url(url_index, film)
+                record(film, DONE, f"→ Finished {film_title}")
+            else:
+                if film.get("letterboxd_url"):
+                    # Search again next run rather than retrying a dead URL
+                    forget_url(url_index, film)
+                record(film, SKIPPED, f"→ Skipped {film_title} ({reason})")
 
     print(f"4️⃣ Start parsing film info: {len(films_to_process)} films remaining")
 
-    # Process each film
-    for idx, film in enumerate(films_to_process, 1):
-        film_title = re.sub(r"[^\w\s]", "", film["title"])
-        
-        # Check if should skip
-        should_skip, reason = _should_skip_film(film, film_title)
-        if should_skip:
-            skipped_films.append(film)
-            print(f"→ Purposefully skipped {film_title} - {reason}")
-        else:
-            # Attempt to scrape
-            try:
-                _scrape_film_from_letterboxd(driver, film, film_title, is_ci)
-                done_films.append(film)
-                
-            except TimeoutException:
-                save_debug_info(driver, film_title)
-                skipped_films.append(film)
-                print(f"→ Skipped {film_title} (timeout)")
-                
-            except WebDriverException:
-                save_debug_info(driver, film_title)
-                skipped_films.append(film)
-                print(f"→ Skipped {film_title} (webdriver error)")
-                
-            except Exception as e:
-                save_debug_info(driver, film_title)
-                skipped_films.append(film)
-                print(f"→ Skipped {film_title} (error: {type(e).__name__})")
+    # Signal handlers can only be set from the main thread
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, _exit_on_signal)
+        signal.signal(signal.SIGINT, _exit_on_signal)
+    interrupted = False
+    try:
+        for film, reason in plan["skip"]:
+            record(film, SKIPPED, f"→ Purposefully skipped {_clean_title(film['title'])} - {reason}")
         
-        # Rate limiting delay
-        wait_for_delay(10, 30)
+        for film, cached in plan["cached"]:
+            sources["cache"] += 1
+            film["rating"] = cached["rating"]
+            film["letterboxd_url"] = cached["letterboxd_url"]
+            record(film, DONE, f"→ Served {_clean_title(film['title'])} from rating cache (fetched {cached['fetched_at']})")
         
-        # Periodic saves
-        if idx % 10 == 0:
-            save_progress(done_films, skipped_films, save_state)
+        # Browsers start on the searches while this thread refreshes over HTTP
+        for film in plan["fetch"]:
+            submit_to_browser(film)
         
-        # Restart browser periodically to prevent memory issues
-        films_since_restart += 1
-        if films_since_restart >= RESTART_EVERY_N_FILMS and idx < len(films_to_process):
-            print(f"🔄 Restarting browser after {films_since_restart} films...")
-            save_progress(done_films, skipped_films, save_state)
+        for position, (film, known_url) in enumerate(plan["refresh"]):
+            if not may_start(schedule, "http", http_estimate):
+                deferred += len(plan["refresh"]) - position
+                break
+            film_title = _clean_title(film["title"])
+            film["letterboxd_url"] = known_url
+            start = time.monotonic()
+            with span("http_refresh", film=film["title"]) as attrs:
+                rating = fetch_rating(http_session, known_url, pacer)
+                attrs["outcome"] = DONE if rating else "fallback"
+            record_duration(schedule, "http", time.monotonic() - start)
+            if rating:
+                sources["http"] += 1
+                film["rating"] = rating
+                store_rating(rating_cache, film)
+                remember_url(url_index, film)
+                record(film, DONE, f"→ Refreshed {film_title} over HTTP")
+            else:
+                print(f"→ HTTP fast path missed {film_title}, falling back to browser")
+                submit_to_browser(film)
             
-            try:
-                driver.quit()
-            except Exception as e:
-                print(f"⚠️  Error quitting driver: {e}")
-            
-            driver = create_driver(is_ci)
-            films_since_restart = 0
-            print("✅ Browser restarted successfully")
-
-    # Cleanup
-    driver.quit()
-    print("4️⃣ Finish parsing film info")
+            record_pool_results(block=False)
+        
+        # Wait for the workers to finish the queue, but not past the deadline
+        with span("drain_pool"):
+            record_pool_results(block=True, deadline=schedule['deadline'])
+            if pool is not None and pool['collected'] < pool['submitted']:
+                print(f"⏳ Deadline reached with {pool['submitted'] - pool['collected']} lookup(s) unfinished")
+                deferred += pool['submitted'] - pool['collected']
+                interrupted = True
+    except (KeyboardInterrupt, SystemExit):
+        interrupted = True
+        raise
+    finally:
+        # Cleanup (don't wait on in-flight page loads when interrupted or out of time)
+        if pool is not None:
+            close_pool(pool, wait=not interrupted)
+        if http_session is not None:
+            http_session.close()
+        for spare in handoff:
+            _quit_driver(spare)
+        print_pacer_summary(pacer)
+        _print_source_summary(sources)
+        if deferred:
+            print(f"⏳ {deferred} lookup(s) left for the next run")
+        print("4️⃣ Finish parsing film info")
 
-    # Final save
-    save_progress(done_films, skipped_films, save_state)
-    print(f"5️⃣ Final save complete - {len(done_films)} films parsed")
+        # Final save
+        done_count, _ = export_progress(progress)
+        rated_films = load_films(progress, DONE)
+        progress.close()
+        save_rating_cache(rating_cache)
+        save_url_index(url_index)
+        flush_captures()
+        print(f"5️⃣ Final save complete - {done_count} films parsed")
+    
+    return rated_films
 
 
 # Run main functions
-parse_letterboxd()
-add_events_to_films()
+if __name__ == "__main__":
+    isolate()
+    start_run()
+    try:
+        with span("parse_letterboxd"):
+            parse_letterboxd()
+        with span("add_events_to_films"):
+            add_events_to_films()
+    finally:
+        print_span_summary()
+
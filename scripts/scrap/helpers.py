@@ -3,8 +3,10 @@ Utility helper functions for the Metrograph scraper.
 """
 
 import os
+import re
 import time
 import random
+import unicodedata
 
 
 def is_ci_environment() -> bool:
@@ -30,6 +32,26 @@ def sanitize_filename(text: str, max_length: int = 50) -> str:
     return sanitized[:max_length]
 
 
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for use as a lookup key.
+    
+    Casefolds, strips accents and punctuation, and collapses runs of
+    whitespace (Metrograph often double-spaces director names).
+    
+    Args:
+        text: The text to normalize
+    
+    Returns:
+        The normalized string
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    without_accents = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    without_apostrophes = re.sub(r"['’]", "", without_accents.casefold())
+    cleaned = re.sub(r"[^\w\s]", " ", without_apostrophes)
+    return ' '.join(cleaned.split())
+
+
 def wait_for_delay(min_seconds: float = 0, max_seconds: float = 15) -> None:
     """
     Wait for a random delay to avoid rate limiting.
@@ -0,0 +1,277 @@
+"""
+Bulk ingest of historical Metrograph snapshots into a showtime history.
+
+The workflows commit metrograph.html and metrograph_events.html on every
+run, so git history holds a snapshot of the lineup per run. This walks
+those snapshots (or a directory of saved pages), parses each distinct
+one once with the regular film and event parsers on a process pool, and
+writes data/showtime_history.json: for every date from the first
+snapshot to the last, which films and which events (title and showtime
+text) were listed.
+
+Snapshots only exist for runs that changed a page (git log lists the
+commits that touched it), so a date without one carries the lineup of
+the latest snapshot before it forward.
+
+Snapshots are deduplicated by content before parsing: by blob id for
+git revisions (identical pages committed on many runs share one blob)
+and by SHA-256 for files. Titles are stored once and referenced by
+index, so the history stays small.
+
+Usage (from the repo root):
+    python scripts/scrap/history.py
+    python scripts/scrap/history.py --revs v1.0..main --workers 8
+    python scripts/scrap/history.py --dir ~/metrograph-snapshots
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from extract import iter_films, iter_events
+
+
+# File paths
+FILMS_HTML_FILE = "scripts/scrap/data/metrograph.html"
+EVENTS_HTML_FILE = "scripts/scrap/data/metrograph_events.html"
+HISTORY_FILE = "./scripts/scrap/data/showtime_history.json"
+
+FILMS, EVENTS = "films", "events"
+SNAPSHOT_PATHS = {FILMS_HTML_FILE: FILMS, EVENTS_HTML_FILE: EVENTS}
+
+HISTORY_VERSION = 1
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# (kind, date, content id)
+Snapshot = Tuple[str, str, str]
+
+
+def list_git_snapshots(revs: Optional[str] = None) -> List[Snapshot]:
+    """
+    List every committed version of the two pages.
+
+    Args:
+        revs: Revision range as accepted by git log (defaults to all of HEAD)
+
+    Returns:
+        (kind, commit date, blob id) per commit that changed a page,
+        oldest first
+    """
+    output = subprocess.run(
+        ["git", "log", "--reverse", "--format=commit %cI", "--raw", "--no-abbrev", "--no-renames",
+         *([revs] if revs else []), "--", *SNAPSHOT_PATHS],
+        check=True, capture_output=True, text=True
+    ).stdout
+
+    snapshots = []
+    date = None
+    for line in output.splitlines():
+        if line.startswith("commit "):
+            date = line.split()[1][:10]
+        elif line.startswith(":"):
+            # ":<old mode> <new mode> <old blob> <new blob> <status>\t<path>"
+            fields, path = line.split("\t", 1)
+            blob, status = fields.split()[3:5]
+            if status != "D" and path in SNAPSHOT_PATHS:
+                snapshots.append((SNAPSHOT_PATHS[path], date, blob))
+    return snapshots
+
+
+def read_git_blobs(blobs: List[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Read blobs through one `git cat-file --batch` process.
+
+    Yields:
+        (blob id, text) in the order given
+    """
+    process = subprocess.Popen(
+        ["git", "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+    )
+    try:
+        for blob in blobs:
+            process.stdin.write(f"{blob}\n".encode())
+            process.stdin.flush()
+            header = process.stdout.readline().split()
+            size = int(header[2])
+            content = process.stdout.read(size)
+            process.stdout.read(1)  # trailing newline
+            yield blob, content.decode("utf-8", errors="replace")
+    finally:
+        process.stdin.close()
+        process.wait()
+
+
+def list_dir_snapshots(directory: str) -> Iterator[Tuple[Snapshot, str]]:
+    """
+    Read saved pages from a directory tree.
+
+    A file is an events page if its name contains "events", otherwise a
+    films page. Its date is the first YYYY-MM-DD in its path, or its
+    modification date.
+
+    Yields:
+        ((kind, date, content hash), text) per file
+    """
+    for root, _, names in os.walk(directory):
+        for name in sorted(names):
+            if not name.endswith((".html", ".htm")):
+                continue
+            path = os.path.join(root, name)
+            match = DATE_RE.search(path)
+            date = match.group(0) if match else datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d")
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                html = f.read()
+            kind = EVENTS if "events" in name else FILMS
+            yield (kind, date, hashlib.sha256(html.encode("utf-8")).hexdigest()), html
+
+
+def parse_snapshot(job: Tuple[str, str, str]) -> Tuple[str, list]:
+    """
+    Process pool task: parse one page.
+
+    Args:
+        job: (content id, kind, html)
+
+    Returns:
+        (content id, film titles or (title, showtime) pairs)
+    """
+    content_id, kind, html = job
+    if kind == FILMS:
+        return content_id, sorted({film["title"] for film in iter_films(html) if film["title"]})
+    return content_id, sorted({(event["title"], event["time_date"]) for event in iter_events(html)})
+
+
+def build_history(snapshots: List[Snapshot], parsed: Dict[str, list]) -> Dict:
+    """
+    Fold parsed snapshots into the per-date history.
+
+    Several snapshots on one date are merged, so a date lists everything
+    seen on it. A date with no snapshot of a page gets the latest
+    snapshot before it, so every date between the first and the last
+    snapshot is listed.
+
+    Args:
+        snapshots: (kind, date, content id), oldest first within a date
+        parsed: Content id -> parse_snapshot() items
+
+    Returns:
+        {"version", "titles": [...], "dates": {date: {"films": [title
+        index], "events": [[title index, showtime]]}}}
+    """
+    # date -> kind -> (everything seen that day, the day's last snapshot)
+    observed: Dict[str, Dict[str, Tuple[Set, Set]]] = {}
+    for kind, date, content_id in sorted(snapshots, key=lambda snapshot: snapshot[1]):
+        if content_id in parsed:
+            items = {tuple(item) if kind == EVENTS else item for item in parsed[content_id]}
+            seen, _ = observed.setdefault(date, {}).get(kind, (set(), set()))
+            observed[date][kind] = (seen | items, items)
+
+    by_date: Dict[str, Dict[str, Set]] = {}
+    if observed:
+        lineup = {FILMS: set(), EVENTS: set()}
+        day = datetime.strptime(min(observed), "%Y-%m-%d")
+        while day <= datetime.strptime(max(observed), "%Y-%m-%d"):
+            date = day.strftime("%Y-%m-%d")
+            by_date[date] = {}
+            for kind in (FILMS, EVENTS):
+                if kind in observed.get(date, {}):
+                    by_date[date][kind], lineup[kind] = observed[date][kind]
+                else:
+                    by_date[date][kind] = lineup[kind]
+            day += timedelta(days=1)
+
+    titles = sorted(
+        {title for day in by_date.values() for title in day[FILMS]}
+        | {title for day in by_date.values() for title, _ in day[EVENTS]}
+    )
+    index = {title: i for i, title in enumerate(titles)}
+    return {
+        "version": HISTORY_VERSION,
+        "titles": titles,
+        "dates": {
+            date: {
+                FILMS: sorted(index[title] for title in day[FILMS]),
+                EVENTS: sorted([index[title], time_date] for title, time_date in day[EVENTS])
+            }
+            for date, day in sorted(by_date.items())
+        }
+    }
+
+
+def ingest(
+    revs: Optional[str] = None,
+    directory: Optional[str] = None,
+    workers: Optional[int] = None,
+    path: str = HISTORY_FILE
+) -> Dict:
+    """
+    Parse every distinct snapshot in parallel and write the history.
+
+    Args:
+        revs: Git revision range to read snapshots from
+        directory: Read saved pages from here instead of git
+        workers: Parser processes (defaults to the CPU count)
+        path: History file location
+
+    Returns:
+        The history dict
+    """
+    start = time.monotonic()
+    if directory:
+        snapshots, jobs, seen = [], [], set()
+        for (kind, date, content_id), html in list_dir_snapshots(directory):
+            snapshots.append((kind, date, content_id))
+            if content_id not in seen:
+                seen.add(content_id)
+                jobs.append((content_id, kind, html))
+        job_iter = iter(jobs)
+        distinct = len(jobs)
+    else:
+        snapshots = list_git_snapshots(revs)
+        kinds = {content_id: kind for kind, _, content_id in snapshots}
+        distinct = len(kinds)
+        # Blobs are read lazily, so parsing starts while git is still reading
+        job_iter = (
+            (blob, kinds[blob], html) for blob, html in read_git_blobs(list(kinds))
+        )
+
+    print(f"🗄️  {len(snapshots)} snapshots, {distinct} distinct")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parsed = dict(executor.map(parse_snapshot, job_iter, chunksize=4))
+
+    history = build_history(snapshots, parsed)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+    print(
+        f"🗄️  Wrote {path}: {len(history['dates'])} dates, {len(history['titles'])} titles "
+        f"in {time.monotonic() - start:.1f}s"
+    )
+    return history
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--revs", help="Git revision range (default: all history of HEAD)")
+    source.add_argument("--dir", help="Directory of saved pages instead of git history")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--output", default=HISTORY_FILE, help="History file to write")
+    args = parser.parse_args(argv)
+
+    ingest(revs=args.revs, directory=args.dir, workers=args.workers, path=args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Event ↔ film join index.
+
+Metrograph's events page titles screenings loosely ("ACE Presents Billy
+Madison", "Fantastic Planet preceded by The Finesse"), so events are
+matched to films in three passes, each with its own confidence:
+
+1. exact normalized title (case, accents, punctuation, spacing)
+2. title with "X presents" prefixes and "preceded by" suffixes removed
+3. fuzzy similarity, comparing only films that share a title token with
+   the event (a blocked token index, so matching stays near-linear as
+   the calendar grows instead of comparing every pair)
+
+Directors are normalized the same way and lower the confidence of a
+fuzzy match when they disagree.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+from helpers import normalize_text
+
+
+EXACT_CONFIDENCE = 1.0
+STRIPPED_CONFIDENCE = 0.9
+FUZZY_MIN_CONFIDENCE = 0.75  # fuzzy matches below this are dropped
+DIRECTOR_MISMATCH_PENALTY = 0.8  # multiplier when directors share no name
+
+# Tokens too common to narrow down candidates
+STOPWORDS = {"a", "an", "the", "of", "and", "in", "on", "to", "by", "for", "with", "la", "le", "l"}
+MAX_BLOCK_SIZE = 50  # ignore tokens shared by more films than this
+
+PRESENTS_RE = re.compile(r"^.*?\bpresents\s+")
+PRECEDED_BY_RE = re.compile(r"\s+(?:preceded|followed) by\s.*$")
+
+
+def title_key(title: str) -> str:
+    """Exact join key: the normalized title."""
+    return normalize_text(title)
+
+
+def stripped_key(title: str) -> str:
+    """Join key with presenter prefixes and double-bill suffixes removed."""
+    key = PRECEDED_BY_RE.sub("", title_key(title))
+    return PRESENTS_RE.sub("", key)
+
+
+def _tokens(key: str) -> set:
+    return set(key.split()) - STOPWORDS
+
+
+def _director_names(directors: Any) -> set:
+    """Normalized director name tokens, from a list or its string form."""
+    if isinstance(directors, list):
+        directors = " ".join(directors)
+    return _tokens(normalize_text(directors or "")) - {"multiple", "dirs"}
+
+
+def build_join_index(films: List[Dict]) -> Dict[str, Any]:
+    """
+    Index films for matching events.
+
+    Args:
+        films: Film dicts with title and directors
+
+    Returns:
+        Index dict to pass to match_event()
+    """
+    index = {
+        'keys': [title_key(film["title"]) for film in films],
+        'directors': [_director_names(film.get("directors")) for film in films],
+        'exact': {},
+        'stripped': {},
+        'tokens': {}
+    }
+    for i, film in enumerate(films):
+        index['exact'].setdefault(index['keys'][i], i)
+        index['stripped'].setdefault(stripped_key(film["title"]), i)
+        for token in _tokens(index['keys'][i]):
+            index['tokens'].setdefault(token, []).append(i)
+    return index
+
+
+def match_event(index: Dict[str, Any], event: Dict) -> Optional[Tuple[int, float]]:
+    """
+    Find the film an event screens.
+
+    Args:
+        index: Index from build_join_index()
+        event: Event dict with title and directors
+
+    Returns:
+        Tuple of (film position in the indexed list, confidence), or None
+    """
+    key = title_key(event["title"])
+    if key in index['exact']:
+        return index['exact'][key], EXACT_CONFIDENCE
+
+    key = stripped_key(event["title"])
+    for lookup in (index['exact'], index['stripped']):
+        if key in lookup:
+            return lookup[key], STRIPPED_CONFIDENCE
+
+    # Fuzzy fallback, only against films sharing a selective token
+    candidates = set()
+    for token in _tokens(key):
+        block = index['tokens'].get(token, [])
+        if len(block) <= MAX_BLOCK_SIZE:
+            candidates.update(block)
+
+    directors = _director_names(event.get("directors"))
+    matcher = SequenceMatcher(None, b=key)  # caches its analysis of the event key
+    best = None
+    for i in sorted(candidates):
+        matcher.set_seq1(index['keys'][i])
+        # Cheap upper bounds first; the director penalty only lowers the score
+        if matcher.real_quick_ratio() < FUZZY_MIN_CONFIDENCE or matcher.quick_ratio() < FUZZY_MIN_CONFIDENCE:
+            continue
+        confidence = matcher.ratio()
+        if directors and index['directors'][i] and not directors & index['directors'][i]:
+            confidence *= DIRECTOR_MISMATCH_PENALTY
+        # Never as sure as a title match
+        confidence = min(confidence, STRIPPED_CONFIDENCE - 0.05)
+        if confidence >= FUZZY_MIN_CONFIDENCE and (best is None or confidence > best[1]):
+            best = (i, round(confidence, 2))
+    return best
+
+
+def join_events(films: List[Dict], events: List[Dict]) -> List[List[Dict]]:
+    """
+    Match every event to a film.
+
+    Args:
+        films: Film dicts
+        events: Event dicts in calendar order
+
+    Returns:
+        One list per film (same order as films) of its events, each a copy
+        of the event with a match_confidence, in calendar order
+    """
+    index = build_join_index(films)
+    matched = [[] for _ in films]
+    unmatched = []
+
+    for event in events:
+        match = match_event(index, event)
+        if match is None:
+            unmatched.append(event["title"])
+            continue
+        i, confidence = match
+        matched[i].append({**event, "match_confidence": confidence})
+        if confidence < EXACT_CONFIDENCE:
+            print(f"🔗 Matched event {event['title']!r} to {films[i]['title']!r} ({confidence:.2f})")
+
+    print(f"🔗 Joined {len(events) - len(unmatched)}/{len(events)} events to films")
+    return matched
@@ -0,0 +1,257 @@
+"""
+Change-aware writer for the site's data files.
+
+films.csv is rendered in memory and compared with the file on disk by
+content hash. Only when it really changed is it replaced (atomically,
+through a temporary file) and meta.json's lastUpdated bumped, so a run
+that changed nothing leaves both files untouched and triggers no commit
+or rebuild.
+
+Alongside it, a compact columnar JSON artifact with real arrays and
+numbers is written to static/data/films.<hash>.json. Its name changes
+with its content, so it can be cached forever; meta.json points at the
+current one. The page fetches it in the browser (it is not inlined into
+the prerendered HTML), and the host compresses it on the fly.
+"""
+
+import ast
+import csv
+import glob
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fetch_state import content_hash
+from showtimes import build_showtime_index
+
+
+# File paths
+FILMS_OUTPUT_FILE = "./src/lib/data/films.csv"
+META_OUTPUT_FILE = "./src/lib/data/meta.json"
+
+FILMS_OUTPUT_FIELDS = [
+    "title", "imageUrl", "directors", "synopsis", "year",
+    "rating", "letterboxd_url", "event_description", "event_time_date", "event_starts_at",
+    "events", "poster_webp", "poster_avif"
+]
+
+ARTIFACT_DIR = "./static/data"
+ARTIFACT_URL_PREFIX = "/data"
+ARTIFACT_VERSION = 2  # bump when the layout changes
+
+MAX_REPORTED_ROWS = 10  # changed rows listed individually in the log
+
+
+def render_csv(rows: List[Dict], fieldnames: List[str]) -> str:
+    """Render rows exactly as csv.DictWriter would write them to a file."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _read_text(path: str) -> Optional[str]:
+    """Read a file's text without newline translation, or None if missing."""
+    try:
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_atomic(path: str, text: str) -> None:
+    """Write to a temporary file and rename it into place."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def diff_rows(
+    old_text: Optional[str],
+    rows: List[Dict],
+    fieldnames: List[str],
+    key: str = "title"
+) -> Dict[str, List[str]]:
+    """
+    Compare new rows with a previously written CSV.
+
+    Args:
+        old_text: Previous CSV contents (None if there was no file)
+        rows: New rows
+        fieldnames: Columns being written
+        key: Column identifying a row
+
+    Returns:
+        Dict with 'added' and 'removed' keys, and 'changed' entries of
+        the form "key: field old → new"
+    """
+    old_rows = {row[key]: row for row in csv.DictReader(io.StringIO(old_text or ""))}
+    new_rows = {str(row.get(key, "")): row for row in rows}
+
+    changes = {
+        'added': [k for k in new_rows if k not in old_rows],
+        'removed': [k for k in old_rows if k not in new_rows],
+        'changed': []
+    }
+    for k, row in new_rows.items():
+        old = old_rows.get(k)
+        if old is None:
+            continue
+        for field in fieldnames:
+            old_value, new_value = old.get(field) or "", str(row.get(field, ""))
+            if old_value != new_value:
+                changes['changed'].append(f"{k}: {field} {old_value[:40]!r} → {new_value[:40]!r}")
+    return changes
+
+
+def _as_list(value: Any) -> list:
+    """A list column as a real list, whether it arrives parsed or as CSV text."""
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    if value.startswith("["):
+        # Directors from parsed_films.csv are str() of a Python list, which may
+        # quote each name either way; events are JSON, which only literal_eval
+        # rejects when it holds true/false/null
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return [value]
+
+
+def _as_number(value: Any, kind: type) -> Optional[float]:
+    """A numeric column as int/float, or None when empty or malformed."""
+    try:
+        return kind(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def build_films_artifact(films: List[Dict]) -> Dict[str, Any]:
+    """
+    Lay films out column by column with typed values, plus the
+    day-bucketed showtime index (see showtimes.build_showtime_index).
+
+    Returns:
+        {"version", "count", "columns": {field: [value per film]},
+        "showtimes": {day: [[start, end, film index]]}}
+    """
+    columns = {field: [] for field in FILMS_OUTPUT_FIELDS}
+    for film in films:
+        for field in FILMS_OUTPUT_FIELDS:
+            value = film.get(field, "")
+            if field in ("directors", "events"):
+                value = _as_list(value)
+            elif field == "year":
+                value = _as_number(value, int)
+            elif field == "rating":
+                value = _as_number(value, float)
+            else:
+                value = value or ""
+            columns[field].append(value)
+    return {
+        "version": ARTIFACT_VERSION,
+        "count": len(films),
+        "columns": columns,
+        "showtimes": build_showtime_index(columns["events"])
+    }
+
+
+def write_films_artifact(films: List[Dict], directory: str = ARTIFACT_DIR) -> str:
+    """
+    Write the content-hashed JSON artifact.
+
+    Older artifacts in the directory are removed. Nothing is rewritten
+    if the artifact for this content already exists.
+
+    Args:
+        films: Film rows with FILMS_OUTPUT_FIELDS
+        directory: Where the artifact is served from
+
+    Returns:
+        The artifact's URL path, e.g. "/data/films.3f2a9c1b7d0e.json"
+    """
+    data = json.dumps(build_films_artifact(films), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    name = f"films.{hashlib.sha256(data).hexdigest()[:12]}.json"
+    path = os.path.join(directory, name)
+
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        print(f"📦 Wrote {path} ({len(data) / 1024:.1f}KB)")
+
+    # Also clears the .gz/.br copies earlier versions wrote
+    for old_path in glob.glob(os.path.join(directory, "films.*.json*")):
+        if os.path.basename(old_path) != name:
+            os.remove(old_path)
+
+    return f"{ARTIFACT_URL_PREFIX}/{name}"
+
+
+def _read_meta(meta_path: str) -> Dict[str, Any]:
+    text = _read_text(meta_path)
+    return json.loads(text) if text else {}
+
+
+def write_films_output(
+    films: List[Dict],
+    path: str = FILMS_OUTPUT_FILE,
+    meta_path: str = META_OUTPUT_FILE,
+    now: Optional[datetime] = None,
+    artifact_dir: str = ARTIFACT_DIR
+) -> bool:
+    """
+    Write films.csv and bump meta.json, but only if the data changed.
+
+    The JSON artifact is always brought up to date, and meta.json is
+    also rewritten (keeping lastUpdated) if it points at a stale one.
+
+    Args:
+        films: Film rows with FILMS_OUTPUT_FIELDS
+        path: films.csv location
+        meta_path: meta.json location
+        now: Update time for meta.json (defaults to utcnow)
+        artifact_dir: Where the JSON artifact is written
+
+    Returns:
+        True if the files were rewritten, False if nothing changed
+    """
+    text = render_csv(films, FILMS_OUTPUT_FIELDS)
+    old_text = _read_text(path)
+    artifact = write_films_artifact(films, artifact_dir)
+    meta = _read_meta(meta_path)
+
+    if old_text is not None and content_hash(old_text) == content_hash(text):
+        print(f"⏭️  {path} unchanged ({len(films)} films), keeping lastUpdated")
+        if meta.get("films") != artifact:
+            _write_atomic(meta_path, json.dumps({**meta, "films": artifact}))
+        return False
+
+    changes = diff_rows(old_text, films, FILMS_OUTPUT_FIELDS)
+    _write_atomic(path, text)
+    print(
+        f"📝 Wrote {path}: {len(changes['added'])} added, {len(changes['removed'])} removed, "
+        f"{len(changes['changed'])} field change(s)"
+    )
+    for change in changes['changed'][:MAX_REPORTED_ROWS]:
+        print(f"   ~ {change}")
+    for title in (changes['added'] + changes['removed'])[:MAX_REPORTED_ROWS]:
+        print(f"   {'+' if title in changes['added'] else '-'} {title}")
+
+    now = now or datetime.utcnow()
+    _write_atomic(meta_path, json.dumps({"lastUpdated": now.strftime("%Y-%m-%dT%H:%M:%SZ"), "films": artifact}))
+    return True
@@ -0,0 +1,144 @@
+"""
+Adaptive request pacing for Letterboxd.
+
+A token bucket keeps page loads within a polite request rate. The
+interval between tokens widens when Letterboxd answers slowly, rate
+limits us (HTTP 429) or serves a challenge page, and narrows back toward
+the configured floor while responses are healthy. Every decision is
+logged so the settings can be tuned from a run's output.
+
+One pacer may be shared by several scraping threads; its rate is then a
+global cap across all of them.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+# Polite ceiling on Letterboxd page loads
+MAX_REQUESTS_PER_MINUTE = float(os.environ.get("LETTERBOXD_MAX_REQUESTS_PER_MINUTE", "6"))
+BURST = 1  # requests that may go out back to back after an idle period
+
+MAX_INTERVAL = 120.0  # seconds, widest the interval may grow
+SLOW_RESPONSE_SECONDS = 8.0  # a page taking longer than this counts as slow
+
+BACKOFF_FACTOR = 2.0  # on 429 / challenge / error
+SLOW_FACTOR = 1.5  # on slow responses
+RECOVERY_FACTOR = 0.8  # on healthy responses
+
+# Response outcomes passed to record_response()
+OK = "ok"
+RATE_LIMITED = "rate_limited"
+CHALLENGE = "challenge"
+ERROR = "error"
+
+
+def create_pacer(
+    max_requests_per_minute: float = MAX_REQUESTS_PER_MINUTE,
+    burst: int = BURST,
+    max_interval: float = MAX_INTERVAL
+) -> Dict[str, Any]:
+    """
+    Create pacer state.
+
+    Args:
+        max_requests_per_minute: Polite rate ceiling (sets the interval floor)
+        burst: Token bucket capacity
+        max_interval: Widest the interval may grow under backoff
+
+    Returns:
+        State dict to pass to pace() and record_response()
+    """
+    floor = 60.0 / max_requests_per_minute
+    return {
+        'floor': floor,
+        'interval': floor,
+        'max_interval': max(floor, max_interval),
+        'capacity': burst,
+        'tokens': float(burst),
+        'last_refill': time.monotonic(),
+        'lock': threading.Lock(),
+        'requests': 0,
+        'total_wait': 0.0
+    }
+
+
+def pace(pacer: Dict[str, Any], label: str = "request") -> float:
+    """
+    Block until a request may be sent, then take a token.
+
+    Tokens are reserved under the lock and may go negative, so concurrent
+    callers queue up one interval apart instead of all waking together.
+
+    Args:
+        pacer: Pacer state (modified in place)
+        label: What the request is for, used in the log line
+
+    Returns:
+        Seconds spent waiting
+    """
+    with pacer['lock']:
+        now = time.monotonic()
+        refill = (now - pacer['last_refill']) / pacer['interval']
+        tokens = min(pacer['capacity'], pacer['tokens'] + refill)
+        pacer['last_refill'] = now
+
+        wait = max(0.0, 1 - tokens) * pacer['interval']
+        pacer['tokens'] = tokens - 1
+        pacer['requests'] += 1
+        pacer['total_wait'] += wait
+
+        print(
+            f"🚦 Pacer: {'waiting ' + format(wait, '.1f') + 's' if wait else 'no wait'} "
+            f"before {label} (interval {pacer['interval']:.1f}s, tokens {tokens:.2f})"
+        )
+
+    if wait:
+        time.sleep(wait)
+    return wait
+
+
+def record_response(
+    pacer: Dict[str, Any],
+    outcome: str = OK,
+    elapsed: Optional[float] = None
+) -> None:
+    """
+    Adapt the interval to how a request went.
+
+    Args:
+        pacer: Pacer state (modified in place)
+        outcome: OK, RATE_LIMITED, CHALLENGE or ERROR
+        elapsed: Seconds the page took to load, if known
+    """
+    with pacer['lock']:
+        _adapt_interval(pacer, outcome, elapsed)
+
+
+def _adapt_interval(pacer: Dict[str, Any], outcome: str, elapsed: Optional[float]) -> None:
+    """Widen or narrow the interval; called with the pacer lock held."""
+    previous = pacer['interval']
+
+    if outcome in (RATE_LIMITED, CHALLENGE, ERROR):
+        reason = outcome
+        interval = previous * BACKOFF_FACTOR
+    elif elapsed is not None and elapsed > SLOW_RESPONSE_SECONDS:
+        reason = f"slow response ({elapsed:.1f}s)"
+        interval = previous * SLOW_FACTOR
+    else:
+        reason = "healthy"
+        interval = previous * RECOVERY_FACTOR
+
+    pacer['interval'] = min(pacer['max_interval'], max(pacer['floor'], interval))
+
+    print(f"🚦 Pacer: {reason}, interval {previous:.1f}s → {pacer['interval']:.1f}s")
+
+
+def print_pacer_summary(pacer: Dict[str, Any]) -> None:
+    """Log how many requests were paced and the time spent waiting."""
+    print(
+        f"🚦 Pacer: {pacer['requests']} requests, {pacer['total_wait']:.0f}s spent waiting, "
+        f"final interval {pacer['interval']:.1f}s"
+    )
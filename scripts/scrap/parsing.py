@@ -0,0 +1,180 @@
+"""
+HTML parser backends for the Metrograph pages.
+
+Both the films and events pages are only read through their
+`div.homepage-in-theater-movie` cards, so each backend parses just those
+subtrees and hands them back wrapped in a small common node interface
+(walked by the extractor in extract.py). Records come out the same
+whichever backend is used.
+
+Backends:
+    html.parser  BeautifulSoup with the stdlib parser (always available)
+    lxml         BeautifulSoup with lxml
+    selectolax   selectolax's lexbor C parser
+"""
+
+import os
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+
+# Class shared by the film and event cards
+CARD_CLASS = "homepage-in-theater-movie"
+
+BACKENDS = ["selectolax", "lxml", "html.parser"]
+
+# "auto" picks the fastest backend that is installed
+PARSER_BACKEND = os.environ.get("SCRAPER_PARSER_BACKEND", "auto")
+
+
+def _is_installed(backend: str) -> bool:
+    """Check whether a backend's optional dependency can be imported."""
+    try:
+        if backend == "selectolax":
+            import selectolax.lexbor  # noqa: F401
+        elif backend == "lxml":
+            import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """
+    Resolve a backend name; "auto" picks the fastest installed backend
+    in BACKENDS order (html.parser is always available).
+
+    Args:
+        backend: Backend name or "auto" (defaults to PARSER_BACKEND)
+
+    Returns:
+        The backend to use
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    backend = backend or PARSER_BACKEND
+    if backend == "auto":
+        return next(name for name in BACKENDS if _is_installed(name))
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend} (expected one of {BACKENDS})")
+    if not _is_installed(backend):
+        raise ValueError(f"Parser backend {backend} is not installed")
+    return backend
+
+
+class SoupNode:
+    """Node interface over a BeautifulSoup tag."""
+
+    __slots__ = ("_tag", "tag")
+
+    def __init__(self, tag):
+        self._tag = tag
+        self.tag = tag.name
+
+    def classes(self) -> List[str]:
+        """The node's class list."""
+        return self._tag.get("class") or []
+
+    def children(self) -> List["SoupNode"]:
+        """Element children, in document order."""
+        return [SoupNode(child) for child in self._tag.children if isinstance(child, Tag)]
+
+    def text(self) -> str:
+        """Text of the subtree, equivalent to get_text(strip=True)."""
+        return self._tag.get_text(strip=True)
+
+    def string(self) -> Optional[str]:
+        """The node's only string, equivalent to Tag.string."""
+        return self._tag.string
+
+    def attr(self, name: str, default: str = "") -> str:
+        """An attribute value, or default if missing."""
+        return self._tag.attrs.get(name, default)
+
+
+class LexborNode:
+    """Node interface over a selectolax lexbor node."""
+
+    __slots__ = ("_node", "tag")
+
+    def __init__(self, node):
+        self._node = node
+        self.tag = node.tag
+
+    def classes(self) -> List[str]:
+        """The node's class list."""
+        return (self._node.attributes.get("class") or "").split()
+
+    def children(self) -> List["LexborNode"]:
+        """Element children, in document order."""
+        return [LexborNode(child) for child in self._node.iter()]
+
+    def text(self) -> str:
+        """Text of the subtree, equivalent to get_text(strip=True)."""
+        return "".join(
+            node.text(deep=False).strip()
+            for node in self._node.traverse(include_text=True)
+            if node.tag == "-text"
+        )
+
+    def string(self) -> Optional[str]:
+        """The node's only string, equivalent to Tag.string."""
+        children = list(self._node.iter(include_text=True))
+        if len(children) != 1:
+            return None
+        child = children[0]
+        if child.tag == "-text":
+            return child.text(deep=False)
+        if child.tag == "-comment":
+            return child.comment_content
+        return LexborNode(child).string()
+
+    def attr(self, name: str, default: str = "") -> str:
+        """An attribute value, or default if missing."""
+        value = self._node.attributes.get(name)
+        return default if value is None else value
+
+
+def _normalize_newlines(html: str) -> str:
+    """Apply the HTML spec's CR/CRLF -> LF input normalization."""
+    return html.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _has_card_class(value) -> bool:
+    """
+    Match the card class while straining.
+
+    The strainer sees the raw class attribute string before BeautifulSoup
+    splits it, so class_=CARD_CLASS alone would never match.
+    """
+    if not value:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return CARD_CLASS in classes
+
+
+def select_cards(html: str, backend: Optional[str] = None) -> list:
+    """
+    Parse only the card subtrees of a Metrograph page.
+
+    Args:
+        html: Raw page html
+        backend: Parser backend (defaults to PARSER_BACKEND)
+
+    Returns:
+        List of card nodes in document order
+    """
+    backend = resolve_backend(backend)
+    html = _normalize_newlines(html)
+
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        tree = LexborHTMLParser(html)
+        return [LexborNode(node) for node in tree.css(f"div.{CARD_CLASS}")]
+
+    strainer = SoupStrainer("div", class_=_has_card_class)
+    soup = BeautifulSoup(html, backend, parse_only=strainer)
+    return [SoupNode(tag) for tag in soup.find_all("div", class_=CARD_CLASS)]
+
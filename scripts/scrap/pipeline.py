@@ -0,0 +1,219 @@
+"""
+In-process pipeline: fetch, parse, rate and merge as one DAG.
+
+Runs the same stages as getRawHtml.py, posters.py and getShowtimes.py, but
+in one process: records are handed from stage to stage in memory, the
+browser that renders the events page is reused for the Letterboxd
+lookups, and stages whose inputs are ready run concurrently (the films
+page is fetched over HTTP while the events page renders).
+
+    films ─────────────┬─> posters ──┐
+                       ├─> ratings ──┴─> merge
+    browser ──> events ┘
+
+Like the scrap workflow, rating and merging are skipped when neither
+page changed, and a changed lineup starts the progress database fresh.
+
+Usage (from the repo root):
+    python scripts/scrap/pipeline.py
+    python scripts/scrap/pipeline.py --local
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from driver import create_driver
+from helpers import is_ci_environment
+from progress import clear_progress
+from cassette import isolate
+from spans import span, start_run, print_span_summary
+from getRawHtml import get_metrograph_films, get_metrograph_events, create_metrograph_session, _report_changed
+from getShowtimes import parse_letterboxd, add_events_to_films
+from posters import update_posters
+
+
+RAW_FILMS_FILE = "./scripts/scrap/data/raw_films.json"
+RAW_EVENTS_FILE = "./scripts/scrap/data/raw_events.json"
+
+
+class Stage(NamedTuple):
+    """
+    A pipeline step: fn(results) runs once every stage in deps is done.
+
+    cleanup(value) releases what fn returned if the run fails afterwards.
+    A main_thread stage always runs on the calling thread.
+    """
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+    cleanup: Optional[Callable[[Any], None]] = None
+    main_thread: bool = False
+
+
+def run_dag(stages: List[Stage], max_workers: int = 2) -> Dict[str, Any]:
+    """
+    Run stages in dependency order, concurrently where possible.
+
+    main_thread stages (the Letterboxd lookups) run on the calling
+    thread while other ready stages carry on in the pool, so they keep
+    the main thread's signal handling; so does any stage that is the
+    only one able to run. If a stage fails, the finished stages'
+    cleanups run (once stages still running have finished) before the
+    exception propagates.
+
+    Args:
+        stages: Stages in any order; deps must name other stages
+        max_workers: Most stages running at once
+
+    Returns:
+        Dict of stage name -> return value
+    """
+    results = {}
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                ready = [s for s in pending.values() if all(dep in results for dep in s.deps)]
+                if not ready and not running:
+                    raise ValueError(f"Unsatisfiable stage dependencies: {sorted(pending)}")
+
+                inline = next((stage for stage in ready if stage.main_thread), None)
+                if inline is None and len(ready) == 1 and not running:
+                    inline = ready[0]
+
+                for stage in ready:
+                    if stage is not inline and not stage.main_thread and len(running) < max_workers:
+                        pending.pop(stage.name)
+                        running[executor.submit(_run_stage, stage, results)] = stage
+
+                if inline is not None:
+                    pending.pop(inline.name)
+                    results[inline.name] = _run_stage(inline, results)
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    # Re-raises the stage's exception
+                    results[stage.name] = future.result()
+    except BaseException:
+        # Leaving the executor waited for running stages; release what finished ones hold
+        for stage in stages:
+            if stage.cleanup is not None and results.get(stage.name) is not None:
+                _cleanup_stage(stage, results[stage.name])
+        raise
+
+    return results
+
+
+def _run_stage(stage: Stage, results: Dict[str, Any]) -> Any:
+    """Run one stage with start/finish log lines."""
+    print(f"▶️  Stage {stage.name} started")
+    start = time.monotonic()
+    with span(f"stage_{stage.name}"):
+        value = stage.fn(results)
+    print(f"⏹️  Stage {stage.name} finished in {time.monotonic() - start:.1f}s")
+    return value
+
+
+def _cleanup_stage(stage: Stage, value: Any) -> None:
+    """Run a stage's cleanup, logging rather than raising its errors."""
+    try:
+        stage.cleanup(value)
+        print(f"🧹 Stage {stage.name} cleaned up")
+    except Exception as e:
+        print(f"⚠️  Stage {stage.name} cleanup failed: {e}")
+
+
+def _load_json(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_stages(is_local: bool, session) -> List[Stage]:
+    """
+    Wire the scraper's stages into a DAG.
+
+    Args:
+        is_local: Parse the saved Metrograph html instead of fetching
+        session: Keep-alive session for both Metrograph pages
+    """
+    def browser(results):
+        # Local runs read saved html; the Letterboxd stage launches its own if needed
+        return None if is_local else create_driver(is_ci_environment())
+
+    def films(results):
+        return get_metrograph_films(is_local, session=session)
+
+    def events(results):
+        return get_metrograph_events(is_local, driver=results["browser"], session=session)
+
+    def posters(results):
+        # Posters only change with the films page, and need the network
+        if is_local or results["films"] is None:
+            return None
+        # Best effort, as in the scrap workflow: films without posters hot-link the original
+        try:
+            return update_posters(results["films"])
+        except Exception as e:
+            print(f"⚠️  Poster prefetch failed, continuing without it: {e}")
+            return None
+
+    def ratings(results):
+        changed = results["films"] is not None or results["events"] is not None
+        if not is_local:
+            _report_changed(changed)
+        if not changed:
+            print("✅ Lineup unchanged, skipping Letterboxd and merge")
+            if results["browser"] is not None:
+                results["browser"].quit()
+            return None
+
+        # A new lineup starts from scratch, as the scrap workflow does
+        if not is_local:
+            clear_progress()
+        raw_films = results["films"] if results["films"] is not None else _load_json(RAW_FILMS_FILE)
+        return parse_letterboxd(raw_films, driver=results["browser"], events=results["events"])
+
+    def merge(results):
+        if results["ratings"] is None:
+            return None
+        raw_events = results["events"] if results["events"] is not None else _load_json(RAW_EVENTS_FILE)
+        return add_events_to_films(results["ratings"], raw_events)
+
+    return [
+        # Quit if a later stage fails; a session ratings already quit only logs a warning
+        Stage("browser", browser, cleanup=lambda driver: driver.quit()),
+        Stage("films", films),
+        Stage("events", events, ("browser",)),
+        # On the main thread, so SIGTERM/SIGINT still trigger the final progress save
+        Stage("ratings", ratings, ("films", "events"), main_thread=True),
+        Stage("posters", posters, ("films",)),
+        Stage("merge", merge, ("ratings", "posters")),
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--local", action="store_true", help="Parse the saved Metrograph html instead of fetching")
+    args = parser.parse_args(argv)
+
+    isolate()
+    start_run()
+    session = create_metrograph_session()
+    try:
+        run_dag(build_stages(args.local, session))
+    finally:
+        session.close()
+        print_span_summary()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
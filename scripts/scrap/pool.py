@@ -0,0 +1,298 @@
+"""
+Bounded worker pool for Letterboxd rating lookups.
+
+K worker threads each own an independent session (a browser from
+create_driver(), or anything else a session factory returns) and pull
+films from one shared queue. Workers never write files: every result is
+handed back to the thread that iterates the pool, which is the single
+writer of progress. The global request rate is enforced by sharing one
+pacer between the workers' scrape functions.
+
+Sessions are recycled when check_session() reports pressure: a standby
+session is launched in the background once pressure reaches
+PREWARM_AT, so the swap at 1.0 is near-instant, and the old session is
+closed in the background too.
+
+The pool keeps track of every live session, so close_pool(wait=False)
+can quit them from the calling thread, with a time limit, when the
+workers are stuck in page loads at a deadline or signal.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from progress import DONE, SKIPPED, DEFERRED
+from recycle import PREWARM_AT
+
+
+# Number of concurrent browser sessions
+SCRAPER_WORKERS = int(os.environ.get("SCRAPER_WORKERS", "1"))
+
+CLOSE_TIMEOUT = 10.0  # seconds close_pool(wait=False) waits for sessions to quit
+
+_STOP = object()
+
+
+def start_pool(
+    workers: int,
+    session_factory: Callable[[], Any],
+    scrape: Callable[[Any, Dict], Tuple[str, str]],
+    close_session: Callable[[Any], None] = lambda session: session.quit(),
+    check_session: Optional[Callable[[Any, int], Tuple[float, str]]] = None,
+    admit: Optional[Callable[[Dict], bool]] = None
+) -> Dict[str, Any]:
+    """
+    Start worker threads waiting for films.
+
+    Each worker creates its session on its first film, so idle workers
+    never launch a browser.
+
+    Args:
+        workers: Number of worker threads (K)
+        session_factory: Creates a new session (e.g. create_driver)
+        scrape: Called as scrape(session, film); updates the film in
+            place and returns (DONE or SKIPPED, reason)
+        close_session: Releases a session
+        check_session: Called as check_session(session, films) after each
+            film; returns (pressure, reason), see recycle.session_pressure
+        admit: Called as admit(film) before a film is started; films it
+            refuses come back as DEFERRED without launching a session
+
+    Returns:
+        Pool state dict to pass to submit(), iter_results() and close_pool()
+    """
+    pool = {
+        'tasks': queue.Queue(),
+        'results': queue.Queue(),
+        'submitted': 0,
+        'collected': 0,
+        'threads': [],
+        'sessions': {},  # live sessions by owner, see _track()
+        'close_session': close_session,
+        'lock': threading.Lock()
+    }
+
+    for worker_id in range(1, workers + 1):
+        thread = threading.Thread(
+            target=_worker,
+            args=(worker_id, pool, session_factory, scrape, close_session, check_session, admit),
+            name=f"scraper-{worker_id}",
+            daemon=True
+        )
+        thread.start()
+        pool['threads'].append(thread)
+
+    print(f"👷 Started {workers} scraper worker(s)")
+    return pool
+
+
+def _worker(
+    worker_id: int,
+    pool: Dict[str, Any],
+    session_factory: Callable[[], Any],
+    scrape: Callable[[Any, Dict], Tuple[str, str]],
+    close_session: Callable[[Any], None],
+    check_session: Optional[Callable[[Any, int], Tuple[float, str]]],
+    admit: Optional[Callable[[Dict], bool]]
+) -> None:
+    """Pull films off the queue until told to stop."""
+    session = None
+    standby = None
+    films_since_restart = 0
+
+    try:
+        while True:
+            film = pool['tasks'].get()
+            if film is _STOP:
+                break
+
+            if admit is not None and not admit(film):
+                pool['results'].put((film, DEFERRED, "out of time"))
+                continue
+
+            try:
+                if session is None:
+                    session = session_factory()
+                    _track(pool, worker_id, session)
+                status, reason = scrape(session, film)
+            except Exception as e:
+                status, reason = SKIPPED, f"worker {worker_id} error: {type(e).__name__}"
+
+            pool['results'].put((film, status, reason))
+
+            films_since_restart += 1
+            if check_session is None or session is None:
+                continue
+            try:
+                pressure, pressure_reason = check_session(session, films_since_restart)
+            except Exception as e:
+                print(f"⚠️  Worker {worker_id}: session check failed: {e}")
+                continue
+
+            if pressure >= PREWARM_AT and standby is None:
+                print(f"🔥 Worker {worker_id}: pre-warming standby session ({pressure_reason})")
+                standby = _start_standby(session_factory, pool, (worker_id, "standby"))
+
+            if pressure >= 1.0:
+                print(f"🔄 Worker {worker_id}: recycling session after {films_since_restart} films ({pressure_reason})")
+                _release(pool, worker_id)
+                _close_in_background(close_session, session)
+                session = _take_standby(standby)
+                _release(pool, (worker_id, "standby"))
+                _track(pool, worker_id, session)
+                standby = None
+                films_since_restart = 0
+    finally:
+        # Sessions close_pool() already quit are no longer tracked
+        if _release(pool, worker_id) is not None:
+            _close_quietly(close_session, session)
+        if standby is not None:
+            spare = _take_standby(standby)
+            if _release(pool, (worker_id, "standby")) is not None:
+                _close_quietly(close_session, spare)
+
+
+def _track(pool: Dict[str, Any], owner: Any, session: Any) -> None:
+    """Record a worker's (or its standby's) live session."""
+    if session is None:
+        return
+    with pool['lock']:
+        pool['sessions'][owner] = session
+
+
+def _release(pool: Dict[str, Any], owner: Any) -> Any:
+    """Stop tracking an owner's session; returns it, or None if already taken."""
+    with pool['lock']:
+        return pool['sessions'].pop(owner, None)
+
+
+def _start_standby(session_factory: Callable[[], Any], pool: Dict[str, Any], owner: Any) -> Dict[str, Any]:
+    """Launch a session on a background thread, tracked under owner."""
+    standby = {'session': None, 'error': None}
+
+    def launch():
+        try:
+            standby['session'] = session_factory()
+            _track(pool, owner, standby['session'])
+        except Exception as e:
+            standby['error'] = e
+
+    standby['thread'] = threading.Thread(target=launch, name="standby-session", daemon=True)
+    standby['thread'].start()
+    return standby
+
+
+def _take_standby(standby: Dict[str, Any]) -> Any:
+    """
+    Wait for a standby session to be ready and return it.
+
+    Returns:
+        The session, or None if it failed to launch (the worker then
+        creates one on its next film)
+    """
+    standby['thread'].join()
+    if standby['error'] is not None:
+        print(f"⚠️  Standby session failed to launch: {standby['error']}")
+    return standby['session']
+
+
+def _close_in_background(close_session: Callable[[Any], None], session: Any) -> None:
+    """Close a retired session without holding up the worker."""
+    threading.Thread(
+        target=_close_quietly, args=(close_session, session), name="retire-session", daemon=True
+    ).start()
+
+
+def _close_quietly(close_session: Callable[[Any], None], session: Any) -> None:
+    """Close a session, logging instead of raising on failure."""
+    try:
+        close_session(session)
+    except Exception as e:
+        print(f"⚠️  Error closing session: {e}")
+
+
+def submit(pool: Dict[str, Any], film: Dict) -> None:
+    """Queue a film for lookup."""
+    pool['submitted'] += 1
+    pool['tasks'].put(film)
+
+
+def iter_results(
+    pool: Dict[str, Any],
+    block: bool = True,
+    deadline: Optional[float] = None
+) -> Iterator[Tuple[Dict, str, str]]:
+    """
+    Yield (film, status, reason) for finished lookups.
+
+    Args:
+        pool: Pool state
+        block: Wait for every submitted film if True; otherwise only
+            yield results that are already available
+        deadline: When blocking, stop waiting at this time.monotonic()
+            value, however many results are still to come
+
+    Yields:
+        One tuple per finished film, in completion order
+    """
+    while pool['collected'] < pool['submitted']:
+        timeout = None
+        if block and deadline is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return
+        try:
+            result = pool['results'].get(block=block, timeout=timeout)
+        except queue.Empty:
+            return
+        pool['collected'] += 1
+        yield result
+
+
+def close_pool(pool: Dict[str, Any], wait: bool = True) -> None:
+    """
+    Stop the workers.
+
+    Args:
+        pool: Pool state
+        wait: Wait for the workers to finish their current film and close
+            their sessions; pass False when exiting on a signal or at a
+            deadline, to quit the sessions from here instead (waiting at
+            most CLOSE_TIMEOUT)
+    """
+    # Drop films nobody has started, e.g. after an interrupt
+    while True:
+        try:
+            pool['tasks'].get_nowait()
+        except queue.Empty:
+            break
+    for _ in pool['threads']:
+        pool['tasks'].put(_STOP)
+    if not wait:
+        _close_sessions(pool, CLOSE_TIMEOUT)
+        return
+    for thread in pool['threads']:
+        thread.join()
+
+
+def _close_sessions(pool: Dict[str, Any], timeout: float) -> None:
+    """Quit every tracked session in parallel, waiting at most timeout seconds."""
+    with pool['lock']:
+        sessions = list(pool['sessions'].values())
+        pool['sessions'].clear()
+    closers = [
+        threading.Thread(target=_close_quietly, args=(pool['close_session'], session), name="close-session", daemon=True)
+        for session in sessions
+    ]
+    for closer in closers:
+        closer.start()
+    deadline = time.monotonic() + timeout
+    for closer in closers:
+        closer.join(max(0.0, deadline - time.monotonic()))
+    if any(closer.is_alive() for closer in closers):
+        print(f"⚠️  Some sessions did not quit within {timeout:.0f}s")
+    elif sessions:
+        print(f"🧹 Quit {len(sessions)} session(s) still in use")
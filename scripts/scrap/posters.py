@@ -0,0 +1,308 @@
+"""
+Poster prefetch, resize and cache pipeline.
+
+Downloads each film's imageUrl (Metrograph uploads and imgix URLs) with a
+small thread pool and conditional requests, and writes resized WebP (and
+AVIF, where Pillow supports it) variants to static/posters, named by the
+source image's content hash. A manifest keyed by source URL remembers
+each poster's validators, hash and variants: posters checked within
+POSTER_RECHECK_DAYS are skipped without a request, older ones are
+revalidated (a 304 or an identical body costs no re-encode).
+
+apply_posters() points the site's output at the local variants; films
+without one keep the hot-linked original.
+
+Usage (from the repo root):
+    python scripts/scrap/posters.py
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import requests
+from PIL import Image, features
+
+from fastpath import create_http_session
+from fetch_state import conditional_headers, remember_validators
+from cassette import route, isolate
+from spans import span, start_run, print_span_summary
+
+
+# File paths
+POSTER_DIR = "./static/posters"
+POSTER_MANIFEST_FILE = "./scripts/scrap/data/poster_manifest.json"
+RAW_FILMS_FILE = "./scripts/scrap/data/raw_films.json"
+POSTER_URL_PREFIX = "/posters"
+
+POSTER_WORKERS = int(os.environ.get("POSTER_WORKERS", "6"))
+POSTER_RECHECK_DAYS = float(os.environ.get("POSTER_RECHECK_DAYS", "7"))
+POSTER_TIMEOUT = 30  # seconds
+
+# Rendered 32px wide in the table; 2x and 4x for dense screens, plus a detail size
+POSTER_WIDTHS = (64, 128, 480)
+DEFAULT_WIDTH = 128  # variant used as the plain src fallback
+
+# Encoder settings per format; AVIF only if this Pillow build has it
+FORMATS = {"webp": {"quality": 80, "method": 6}}
+if features.check("avif"):
+    FORMATS["avif"] = {"quality": 60}
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def load_poster_manifest(path: str = POSTER_MANIFEST_FILE) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the poster manifest.
+
+    Returns:
+        Dict of source URL -> entry (empty if none saved yet)
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_poster_manifest(manifest: Dict[str, Dict[str, Any]], path: str = POSTER_MANIFEST_FILE) -> None:
+    """Write the manifest to disk atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _variants_exist(entry: Dict[str, Any], directory: str) -> bool:
+    """Whether every variant file an entry lists is still on disk."""
+    variants = entry.get("variants") or {}
+    return bool(variants) and all(
+        os.path.exists(os.path.join(directory, os.path.basename(url)))
+        for widths in variants.values() for url in widths.values()
+    )
+
+
+def _is_fresh(entry: Dict[str, Any], now: datetime, directory: str) -> bool:
+    """Whether a poster was checked recently enough to skip the request."""
+    try:
+        checked_at = datetime.strptime(entry["checked_at"], TIMESTAMP_FORMAT)
+    except (KeyError, ValueError):
+        return False
+    return now - checked_at < timedelta(days=POSTER_RECHECK_DAYS) and _variants_exist(entry, directory)
+
+
+def render_variants(data: bytes, digest: str, directory: str = POSTER_DIR) -> Dict[str, Dict[str, str]]:
+    """
+    Encode the resized variants of a poster, skipping files that exist.
+
+    Args:
+        data: Original image bytes
+        digest: Content hash naming the variants
+        directory: Where variants are written
+
+    Returns:
+        Dict of format -> {width: URL path}
+    """
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    os.makedirs(directory, exist_ok=True)
+    variants = {fmt: {} for fmt in FORMATS}
+    # Never upscale; a small original gets one variant at its own width
+    widths = sorted({min(width, image.width) for width in POSTER_WIDTHS})
+    for width in widths:
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt, options in FORMATS.items():
+            name = f"{digest}-{width}.{fmt}"
+            path = os.path.join(directory, name)
+            if not os.path.exists(path):
+                tmp_path = f"{path}.tmp"
+                resized.save(tmp_path, format=fmt.upper(), **options)
+                os.replace(tmp_path, path)
+            variants[fmt][str(width)] = f"{POSTER_URL_PREFIX}/{name}"
+    return variants
+
+
+def fetch_poster(
+    session: requests.Session,
+    url: str,
+    entry: Dict[str, Any],
+    directory: str = POSTER_DIR
+) -> Dict[str, Any]:
+    """
+    Revalidate one poster and (re)build its variants if it changed.
+
+    Args:
+        session: HTTP session
+        url: Source image URL
+        entry: Manifest entry from the last run (empty if new)
+        directory: Where variants are written
+
+    Returns:
+        The updated manifest entry; the old one if the download failed
+    """
+    entry = dict(entry)
+    with span("poster_fetch") as attrs:
+        try:
+            response = session.get(route(url), headers=conditional_headers(entry), timeout=POSTER_TIMEOUT)
+        except requests.RequestException as e:
+            print(f"⚠️  Poster download failed for {url}: {e}")
+            attrs["outcome"] = "error"
+            return entry
+        attrs["status"] = response.status_code
+
+        if response.status_code == 304 and _variants_exist(entry, directory):
+            attrs["outcome"] = "not modified"
+            # Many servers leave the validators out of a 304; keep the stored ones then
+            remember_validators(entry, response.headers, keep_missing=True)
+        elif response.status_code != 200:
+            print(f"⚠️  Poster download failed for {url}: HTTP {response.status_code}")
+            attrs["outcome"] = "error"
+            return entry
+        else:
+            digest = hashlib.sha256(response.content).hexdigest()[:16]
+            if digest == entry.get("hash") and _variants_exist(entry, directory):
+                attrs["outcome"] = "unchanged"
+            else:
+                try:
+                    with span("poster_encode"):
+                        entry["variants"] = render_variants(response.content, digest, directory)
+                except Exception as e:
+                    # Pillow raises OSError for undecodable images, DecompressionBombError
+                    # for oversized ones and ValueError/MemoryError on other bad input
+                    print(f"⚠️  Could not encode poster {url}: {e}")
+                    attrs["outcome"] = "error"
+                    return entry
+                entry["hash"] = digest
+                attrs["outcome"] = "encoded"
+                print(f"🖼️  Poster encoded: {url}")
+            remember_validators(entry, response.headers)
+
+    entry["checked_at"] = datetime.utcnow().strftime(TIMESTAMP_FORMAT)
+    return entry
+
+
+def prefetch_posters(
+    films: List[Dict],
+    manifest: Optional[Dict[str, Dict[str, Any]]] = None,
+    workers: int = POSTER_WORKERS,
+    directory: str = POSTER_DIR,
+    now: Optional[datetime] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Bring every film's poster variants up to date.
+
+    Args:
+        films: Films with an imageUrl
+        manifest: Manifest to update (loaded from disk if None)
+        workers: Concurrent downloads
+        directory: Where variants are written
+        now: Current time (defaults to utcnow)
+
+    Returns:
+        The manifest, limited to posters of the given films
+    """
+    manifest = load_poster_manifest() if manifest is None else manifest
+    now = now or datetime.utcnow()
+
+    urls = list(dict.fromkeys(film["imageUrl"] for film in films if film.get("imageUrl")))
+    stale = [url for url in urls if not _is_fresh(manifest.get(url, {}), now, directory)]
+    print(f"🖼️  Posters: {len(urls) - len(stale)} fresh, {len(stale)} to check")
+
+    if stale:
+        session = create_http_session()
+        session.headers["Accept"] = "image/avif,image/webp,image/*"
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poster") as executor:
+                entries = executor.map(lambda url: fetch_poster(session, url, manifest.get(url, {}), directory), stale)
+                for url, entry in zip(stale, entries):
+                    manifest[url] = entry
+        finally:
+            session.close()
+
+    # Posters of films that left the lineup drop out of the manifest
+    return {url: manifest[url] for url in urls if url in manifest}
+
+
+def remove_unused_variants(manifest: Dict[str, Dict[str, Any]], directory: str = POSTER_DIR) -> int:
+    """
+    Delete variant files no manifest entry refers to.
+
+    Returns:
+        Number of files removed
+    """
+    if not os.path.isdir(directory):
+        return 0
+    used = {
+        os.path.basename(url)
+        for entry in manifest.values()
+        for widths in (entry.get("variants") or {}).values()
+        for url in widths.values()
+    }
+    removed = 0
+    for name in os.listdir(directory):
+        if name not in used:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+    return removed
+
+
+def _srcset(widths: Dict[str, str]) -> str:
+    return ", ".join(f"{url} {width}w" for width, url in sorted(widths.items(), key=lambda item: int(item[0])))
+
+
+def apply_posters(films: List[Dict], manifest: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Point films at their local poster variants (modified in place).
+
+    imageUrl becomes the DEFAULT_WIDTH WebP (or the widest below it),
+    and poster_webp / poster_avif hold srcset strings. Films without
+    variants keep their original imageUrl and empty srcsets.
+    """
+    for film in films:
+        variants = (manifest.get(film.get("imageUrl", "")) or {}).get("variants") or {}
+        film["poster_webp"] = _srcset(variants.get("webp", {}))
+        film["poster_avif"] = _srcset(variants.get("avif", {}))
+        webp = variants.get("webp")
+        if webp:
+            fallback = max((int(width) for width in webp if int(width) <= DEFAULT_WIDTH), default=min(map(int, webp)))
+            film["imageUrl"] = webp[str(fallback)]
+
+
+def update_posters(films: List[Dict]) -> Dict[str, Dict[str, Any]]:
+    """
+    Prefetch the lineup's posters, save the manifest and drop old variants.
+
+    Returns:
+        The saved manifest
+    """
+    manifest = prefetch_posters(films)
+    save_poster_manifest(manifest)
+    removed = remove_unused_variants(manifest)
+    ready = sum(1 for entry in manifest.values() if entry.get("variants"))
+    print(f"🖼️  {ready} posters ready, {removed} unused variant file(s) removed")
+    return manifest
+
+
+def main() -> int:
+    with open(RAW_FILMS_FILE, "r", encoding="utf-8") as f:
+        update_posters(json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    isolate()
+    start_run()
+    try:
+        exit_code = main()
+    finally:
+        print_span_summary()
+    sys.exit(exit_code)
@@ -1,127 +1,245 @@
 """
 Progress tracking for incremental film scraping.
 
-Handles saving progress to CSV files so scraping can resume
-after interruptions without losing work.
+Every finished film is upserted into a single SQLite database and
+committed straight away, so scraping can resume after an interruption
+without losing work or leaving a torn row behind. The final CSVs read by
+add_events_to_films() are exported from the database.
+
+The database itself stays out of git. Every recorded film is also
+appended to progress.jsonl (one JSON object per line; a later line for
+the same title wins), which the workflows commit, so a run killed
+outright keeps everything it finished. export_progress() rewrites it
+compacted, in recording order. open_progress() rebuilds the database
+from it when the database file is missing, as on a fresh checkout, or
+from the *_progress.csv files older versions kept if there is no export
+yet.
 """
 
 import csv
-from typing import List, Dict, Any
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import List, Dict, Optional, Set, Tuple
 
 
 # CSV field definitions
 PARSED_FILMS_FIELDS = [
-    "title", "imageUrl", "directors", "synopsis", 
+    "title", "imageUrl", "directors", "synopsis",
     "year", "rating", "letterboxd_url"
 ]
 
 SKIPPED_FILMS_FIELDS = [
-    "title", "imageUrl", "directors", "year", 
+    "title", "imageUrl", "directors", "year",
     "synopsis", "letterboxd_url"
 ]
 
 # File paths
-PARSED_PROGRESS_FILE = "./scripts/scrap/data/parsed_films_progress.csv"
+PROGRESS_DB_FILE = "./scripts/scrap/data/progress.sqlite3"
+PROGRESS_EXPORT_FILE = "./scripts/scrap/data/progress.jsonl"
 PARSED_FINAL_FILE = "./scripts/scrap/data/parsed_films.csv"
-SKIPPED_PROGRESS_FILE = "./scripts/scrap/data/skipped_films_progress.csv"
 SKIPPED_FINAL_FILE = "./scripts/scrap/data/skipped_films.csv"
 
+# Film statuses
+DONE = "done"
+SKIPPED = "skipped"
+DEFERRED = "deferred"  # left for the next run; never recorded
+
+# Progress files written before the database, imported once
+LEGACY_PROGRESS_FILES = {
+    DONE: "./scripts/scrap/data/parsed_films_progress.csv",
+    SKIPPED: "./scripts/scrap/data/skipped_films_progress.csv"
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS films (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS films_status ON films (status);
+"""
+
+UPSERT = """
+INSERT INTO films (title, status, data, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (title) DO UPDATE SET
+    status = excluded.status,
+    data = excluded.data,
+    updated_at = excluded.updated_at
+"""
+
+
+def _now() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _read_progress_export(filename: str) -> List[Dict]:
+    """Rows of a progress export, skipping a line torn by a kill mid-write."""
+    rows = []
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                print(f"⚠️  Skipping unreadable line in {filename}")
+    return rows
+
+
+def _read_legacy_progress(files: Dict[str, str]) -> List[Dict]:
+    """Rows in export form from the old parsed/skipped progress CSVs."""
+    rows = []
+    for status, filename in files.items():
+        if not os.path.exists(filename):
+            continue
+        with open(filename, "r", encoding="utf-8", newline="") as f:
+            for film in csv.DictReader(f):
+                rows.append({"title": film["title"], "status": status, "updated_at": _now(), "data": film})
+    return rows
 
-def create_save_state(already_processed_count: int = 0) -> Dict[str, Any]:
+
+def open_progress(path: str = PROGRESS_DB_FILE, export_path: str = PROGRESS_EXPORT_FILE) -> sqlite3.Connection:
     """
-    Create initial save state for tracking progress.
-    
+    Open (creating if needed) the progress database.
+
+    A missing database is rebuilt from the text export or, without one,
+    from the legacy progress CSVs.
+
     Args:
-        already_processed_count: Number of films already processed (for resume)
-    
+        path: Database file location
+        export_path: Text export location
+
     Returns:
-        State dict to pass to save_progress()
+        Connection to pass to the other progress functions
     """
-    return {
-        'first_save': already_processed_count == 0,
-        'last_saved_done_count': 0,
-        'last_saved_skipped_count': 0
-    }
+    rows, source = [], None
+    if not os.path.exists(path):
+        if os.path.exists(export_path):
+            rows, source = _read_progress_export(export_path), export_path
+        else:
+            rows, source = _read_legacy_progress(LEGACY_PROGRESS_FILES), "legacy progress CSVs"
+
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    if rows:
+        with conn:
+            conn.executemany(UPSERT, (
+                (row["title"], row["status"], json.dumps(row["data"], ensure_ascii=False), row["updated_at"])
+                for row in rows
+            ))
+        print(f"📂 Rebuilt progress database from {source} ({len(rows)} records)")
+        # Start the export afresh, so appends never follow a torn line
+        _write_progress_export(conn, export_path)
+    return conn
+
 
+def clear_progress(path: str = PROGRESS_DB_FILE, export_path: str = PROGRESS_EXPORT_FILE) -> None:
+    """Forget all progress: remove the database, its text export and any legacy CSVs."""
+    for filename in (path, export_path, *LEGACY_PROGRESS_FILES.values()):
+        if os.path.exists(filename):
+            os.remove(filename)
 
-def save_progress(
-    done_films: List[Dict], 
-    skipped_films: List[Dict], 
-    state: Dict[str, Any]
+
+def record_film(
+    conn: sqlite3.Connection,
+    film: Dict,
+    status: str,
+    export_path: str = PROGRESS_EXPORT_FILE
 ) -> None:
     """
-    Save scraping progress to CSV files.
-    
-    Writes incrementally - only new films since last save are appended.
-    Saves to both progress files (for resume) and final files.
-    
+    Upsert a finished film, commit it and append it to the text export.
+
+    A film recorded twice keeps its original position and takes the
+    latest status and data.
+
     Args:
-        done_films: List of successfully parsed film dicts
-        skipped_films: List of skipped film dicts
-        state: Progress state dict (modified in place)
+        conn: Progress database
+        film: Film dict
+        status: DONE or SKIPPED
+        export_path: Text export location
+    """
+    updated_at = _now()
+    conn.execute(UPSERT, (film["title"], status, json.dumps(film, ensure_ascii=False), updated_at))
+    conn.commit()
+
+    row = {"title": film["title"], "status": status, "updated_at": updated_at, "data": film}
+    with open(export_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def load_processed_titles(conn: sqlite3.Connection, status: Optional[str] = None) -> Set[str]:
+    """
+    Titles already recorded, optionally only those with a given status.
     """
-    # Determine write mode
-    if state['first_save']:
-        mode = "w"
-        write_header = True
-        state['first_save'] = False
+    if status is None:
+        rows = conn.execute("SELECT title FROM films")
     else:
-        mode = "a"
-        write_header = False
-    
-    # Save parsed films
-    new_done = done_films[state['last_saved_done_count']:]
-    if new_done or mode == "w":
-        _write_films_csv(
-            filenames=[PARSED_PROGRESS_FILE, PARSED_FINAL_FILE],
-            films=new_done,
-            fieldnames=PARSED_FILMS_FIELDS,
-            mode=mode,
-            write_header=write_header
-        )
-    
-    # Save skipped films
-    new_skipped = skipped_films[state['last_saved_skipped_count']:]
-    if new_skipped or mode == "w":
-        _write_films_csv(
-            filenames=[SKIPPED_PROGRESS_FILE, SKIPPED_FINAL_FILE],
-            films=new_skipped,
-            fieldnames=SKIPPED_FILMS_FIELDS,
-            mode=mode,
-            write_header=write_header
-        )
-    
-    # Update state
-    state['last_saved_done_count'] = len(done_films)
-    state['last_saved_skipped_count'] = len(skipped_films)
-    
+        rows = conn.execute("SELECT title FROM films WHERE status = ?", (status,))
+    return {title for (title,) in rows}
+
+
+def load_films(conn: sqlite3.Connection, status: str) -> List[Dict]:
+    """
+    Recorded films with a given status, in the order they were first recorded.
+    """
+    rows = conn.execute("SELECT data FROM films WHERE status = ? ORDER BY seq", (status,))
+    return [json.loads(data) for (data,) in rows]
+
+
+def export_progress(conn: sqlite3.Connection, export_path: str = PROGRESS_EXPORT_FILE) -> Tuple[int, int]:
+    """
+    Write the final parsed and skipped CSVs and the text export from the database.
+
+    Returns:
+        Tuple of (done count, skipped count)
+    """
+    done_films = load_films(conn, DONE)
+    skipped_films = load_films(conn, SKIPPED)
+    _write_films_csv(PARSED_FINAL_FILE, done_films, PARSED_FILMS_FIELDS)
+    _write_films_csv(SKIPPED_FINAL_FILE, skipped_films, SKIPPED_FILMS_FIELDS)
+    _write_progress_export(conn, export_path)
+
     print(f"💾 Progress saved: {len(done_films)} done, {len(skipped_films)} skipped")
+    return len(done_films), len(skipped_films)
 
 
-def _write_films_csv(
-    filenames: List[str],
-    films: List[Dict],
-    fieldnames: List[str],
-    mode: str,
-    write_header: bool
-) -> None:
+def _write_films_csv(filename: str, films: List[Dict], fieldnames: List[str]) -> None:
     """
-    Write films to multiple CSV files.
-    
+    Write films to a CSV file, replacing it atomically.
+
     Args:
-        filenames: List of file paths to write to
+        filename: File path to write to
         films: List of film dicts to write
         fieldnames: CSV column names
-        mode: File mode ('w' or 'a')
-        write_header: Whether to write the header row
     """
-    for filename in filenames:
-        with open(filename, mode, newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f, 
-                fieldnames=fieldnames, 
-                extrasaction='ignore'
-            )
-            if write_header:
-                writer.writeheader()
-            writer.writerows(films)
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(
+            f,
+            fieldnames=fieldnames,
+            extrasaction='ignore'
+        )
+        writer.writeheader()
+        writer.writerows(films)
+    os.replace(tmp_path, filename)
+
+
+def _write_progress_export(conn: sqlite3.Connection, filename: str) -> None:
+    """
+    Write every row of the database as JSON lines, replacing the file atomically.
+
+    Args:
+        conn: Progress database
+        filename: File path to write to
+    """
+    rows = conn.execute("SELECT title, status, data, updated_at FROM films ORDER BY seq")
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for title, status, data, updated_at in rows:
+            row = {"title": title, "status": status, "updated_at": updated_at, "data": json.loads(data)}
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, filename)
@@ -0,0 +1,111 @@
+"""
+Readiness-based waiting for browser page loads.
+
+Replaces fixed sleeps with polling for the conditions that actually mean
+a page is ready: a target selector is present, the number of matching
+elements has stopped changing, and network activity is idle. Every wait
+has a hard ceiling and reports how long it actually took.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+
+READY_TIMEOUT = 30  # seconds, hard ceiling for any wait
+STABLE_FOR_MS = 750  # selector match count must hold this long
+NETWORK_IDLE_MS = 500  # no new resource loads or jQuery requests for this long
+POLL_INTERVAL = 0.2  # seconds
+
+# One round-trip per poll: document state, in-flight jQuery requests
+# (Metrograph loads showtimes through admin-ajax), resource count and
+# selector match count.
+READINESS_SCRIPT = """
+return [
+    document.readyState,
+    (window.jQuery && window.jQuery.active) || 0,
+    performance.getEntriesByType('resource').length,
+    arguments[0] ? document.querySelectorAll(arguments[0]).length : 0
+];
+"""
+
+
+def wait_until_ready(
+    driver,
+    selector: Optional[str] = None,
+    label: str = "Page",
+    timeout: float = READY_TIMEOUT,
+    stable_ms: int = STABLE_FOR_MS,
+    idle_ms: int = NETWORK_IDLE_MS
+) -> Dict[str, Any]:
+    """
+    Wait until the current page is ready, or the timeout is reached.
+
+    Ready means all of:
+    - selector matches at least one element (skipped if selector is None)
+    - the selector's match count has not changed for stable_ms
+    - the document is complete and the network has been idle for idle_ms
+
+    Args:
+        driver: Selenium/SeleniumBase WebDriver instance
+        selector: CSS selector for the content being waited on
+        label: Name used in the log line
+        timeout: Hard ceiling in seconds
+        stable_ms: How long the match count must hold steady
+        idle_ms: How long the network must be quiet
+
+    Returns:
+        Report dict with ready, elapsed (seconds), count and the state
+        of each condition when the wait ended
+    """
+    start = time.monotonic()
+    last_count, count_since = None, start
+    last_resources, resources_since = None, start
+    present = stable = idle = False
+    count = 0
+
+    while True:
+        now = time.monotonic()
+        try:
+            ready_state, active_requests, resources, count = driver.execute_script(
+                READINESS_SCRIPT, selector
+            )
+        except Exception:
+            # Page is mid-navigation; treat as not ready yet
+            ready_state, active_requests, resources, count = "loading", 1, last_resources, 0
+
+        if count != last_count:
+            last_count, count_since = count, now
+        if resources != last_resources:
+            last_resources, resources_since = resources, now
+
+        present = selector is None or count > 0
+        stable = (now - count_since) * 1000 >= stable_ms
+        idle = (
+            ready_state == "complete"
+            and active_requests == 0
+            and (now - resources_since) * 1000 >= idle_ms
+        )
+
+        if (present and stable and idle) or now - start >= timeout:
+            break
+        time.sleep(POLL_INTERVAL)
+
+    elapsed = time.monotonic() - start
+    ready = present and stable and idle
+    if ready:
+        print(f"⏱️  {label} ready after {elapsed:.1f}s ({count} matching elements)")
+    else:
+        print(
+            f"⚠️  {label} not ready after {elapsed:.1f}s "
+            f"(present={present}, stable={stable}, idle={idle}), continuing"
+        )
+
+    return {
+        "label": label,
+        "ready": ready,
+        "elapsed": round(elapsed, 3),
+        "count": count,
+        "present": present,
+        "stable": stable,
+        "idle": idle,
+    }
@@ -0,0 +1,122 @@
+"""
+Health-based browser recycling.
+
+Instead of restarting every N films, a browser session is recycled when
+the resident memory of its process tree (chromedriver, Chrome and every
+renderer) approaches a ceiling, or when its page loads have drifted well
+above how fast it was when fresh. Both are folded into one pressure
+value: the pool pre-warms a standby session once pressure reaches
+PREWARM_AT and swaps to it at 1.0.
+
+Memory is read from /proc, so on systems without it only latency and the
+films-per-session backstop apply.
+"""
+
+import os
+import statistics
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+
+# Resident memory allowed for one browser's process tree
+BROWSER_RSS_CEILING_MB = float(os.environ.get("BROWSER_RSS_CEILING_MB", "1024"))
+
+LATENCY_DRIFT_FACTOR = 2.0  # recycle when recent loads take this many times the baseline
+BASELINE_SAMPLES = 3  # first page loads of a session, defining its baseline
+RECENT_SAMPLES = 5  # latest page loads compared against the baseline
+MAX_FILMS_PER_SESSION = 200  # backstop if neither signal is available
+
+PREWARM_AT = 0.8  # pressure at which a standby session is launched
+
+# Page-load samples per live session, keyed by id(session)
+_sessions: Dict[int, Dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def record_page_load(session: Any, elapsed: float) -> None:
+    """Record how long a page load took in a session."""
+    with _lock:
+        stats = _sessions.setdefault(id(session), {
+            'baseline': [],
+            'recent': deque(maxlen=RECENT_SAMPLES)
+        })
+        if len(stats['baseline']) < BASELINE_SAMPLES:
+            stats['baseline'].append(elapsed)
+        else:
+            stats['recent'].append(elapsed)
+
+
+def forget_session(session: Any) -> None:
+    """Drop a closed session's samples."""
+    with _lock:
+        _sessions.pop(id(session), None)
+
+
+def _browser_pid(driver: Any) -> Optional[int]:
+    """Root pid of a driver's process tree, if it can be found."""
+    # undetected-chromedriver launches Chrome itself; otherwise chromedriver is the root
+    pid = getattr(driver, "browser_pid", None)
+    if pid:
+        return pid
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Resident memory of a process and all its descendants, in bytes.
+
+    Returns:
+        RSS in bytes, or None if /proc is unavailable
+    """
+    if not os.path.isdir("/proc"):
+        return None
+
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/statm", "r") as f:
+                total += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            for tid in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{tid}/children", "r") as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            # Process exited while walking the tree
+            continue
+    return total
+
+
+def session_pressure(driver: Any, films: int) -> Tuple[float, str]:
+    """
+    How close a browser session is to needing a restart.
+
+    Args:
+        driver: Browser session
+        films: Films scraped since the session started
+
+    Returns:
+        Tuple of (pressure, reason); pressure >= 1.0 means recycle now
+    """
+    readings = [(films / MAX_FILMS_PER_SESSION, f"{films} films")]
+
+    pid = _browser_pid(driver)
+    rss = process_tree_rss(pid) if pid else None
+    if rss is not None:
+        rss_mb = rss / (1024 * 1024)
+        readings.append((rss_mb / BROWSER_RSS_CEILING_MB, f"RSS {rss_mb:.0f}MB of {BROWSER_RSS_CEILING_MB:.0f}MB"))
+
+    with _lock:
+        stats = _sessions.get(id(driver))
+        if stats and len(stats['recent']) == RECENT_SAMPLES:
+            baseline = statistics.median(stats['baseline'])
+            recent = statistics.median(stats['recent'])
+            if baseline > 0:
+                drift = recent / baseline
+                readings.append((drift / LATENCY_DRIFT_FACTOR, f"page loads {drift:.1f}x slower than fresh"))
+
+    return max(readings)
@@ -0,0 +1,130 @@
+"""
+Persistent title → Letterboxd URL resolution index.
+
+Resolving a film to its Letterboxd page costs a search page load. The
+result is kept on disk keyed by normalized (title, year), so recurring
+repertory titles go straight to their film page on later runs.
+
+Hand-maintained overrides in letterboxd_overrides.json take precedence
+over anything the search resolved, for titles the search gets wrong.
+Keys there are written as "Title|Year" and normalized on load.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from helpers import normalize_text
+from cache import TIMESTAMP_FORMAT
+
+
+# File paths
+URL_INDEX_FILE = "./scripts/scrap/data/letterboxd_urls.json"
+URL_OVERRIDES_FILE = "./scripts/scrap/data/letterboxd_overrides.json"
+
+
+def resolution_key(title: str, year: Any) -> str:
+    """
+    Build the index key for a film.
+
+    Returns:
+        Key of the form "title|year", with the title normalized
+    """
+    return f"{normalize_text(title)}|{str(year).strip()}"
+
+
+def load_url_index(
+    path: str = URL_INDEX_FILE,
+    overrides_path: str = URL_OVERRIDES_FILE
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the resolution index and manual overrides from disk.
+
+    Args:
+        path: Index file location
+        overrides_path: Overrides file location
+
+    Returns:
+        Dict with 'resolved' (key -> entry) and 'overrides' (key -> URL)
+    """
+    resolved = _load_json(path, "URL index")
+    overrides = {}
+    for key, url in _load_json(overrides_path, "URL overrides").items():
+        title, _, year = key.rpartition("|")
+        overrides[resolution_key(title, year)] = url
+
+    print(f"🔗 Loaded URL index: {len(resolved)} resolved, {len(overrides)} overrides")
+    return {'resolved': resolved, 'overrides': overrides}
+
+
+def _load_json(path: str, label: str) -> Dict[str, Any]:
+    """Read a JSON object, treating a missing or unreadable file as empty."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"⚠️  {label} is unreadable, ignoring it: {e}")
+        return {}
+
+
+def resolve_url(index: Dict[str, Dict[str, Any]], film: Dict) -> Optional[str]:
+    """
+    Look up a film's Letterboxd URL.
+
+    Args:
+        index: Index from load_url_index()
+        film: Film dict with title and year
+
+    Returns:
+        The override URL if there is one, else the resolved URL, else None
+    """
+    key = resolution_key(film.get("title", ""), film.get("year", ""))
+    if key in index['overrides']:
+        return index['overrides'][key]
+    entry = index['resolved'].get(key)
+    return entry["letterboxd_url"] if entry else None
+
+
+def remember_url(
+    index: Dict[str, Dict[str, Any]],
+    film: Dict,
+    now: Optional[datetime] = None
+) -> None:
+    """
+    Record the URL a film was resolved to.
+
+    Args:
+        index: Index from load_url_index() (modified in place)
+        film: Film dict with letterboxd_url set
+        now: Resolution time (defaults to utcnow)
+    """
+    if not film.get("letterboxd_url"):
+        return
+    now = now or datetime.utcnow()
+    index['resolved'][resolution_key(film["title"], film["year"])] = {
+        "title": film["title"],
+        "letterboxd_url": film["letterboxd_url"],
+        "resolved_at": now.strftime(TIMESTAMP_FORMAT)
+    }
+
+
+def forget_url(index: Dict[str, Dict[str, Any]], film: Dict) -> None:
+    """Drop a resolved URL that no longer leads to a rating."""
+    index['resolved'].pop(resolution_key(film["title"], film["year"]), None)
+
+
+def save_url_index(index: Dict[str, Dict[str, Any]], path: str = URL_INDEX_FILE) -> None:
+    """
+    Write the resolved URLs to disk (overrides are never written back).
+
+    Args:
+        index: Index from load_url_index()
+        path: Index file location
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index['resolved'], f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -0,0 +1,161 @@
+"""
+Deadline-aware, priority-ordered scheduling of Letterboxd lookups.
+
+Time-boxed runs (the 5-minute workflow) set SCRAPER_DEADLINE_SECONDS to
+their budget, counted from process start. Films are looked up in order
+of value rather than page order:
+
+    1. never rated, soonest event first
+    2. with an event within EVENT_HORIZON_DAYS, soonest first
+    3. everything else, stalest cached rating first
+
+Once the typical time a lookup takes would carry it past the deadline,
+may_start() refuses new lookups, leaving them for the next run, so the run
+ends with its final save instead of being killed mid-write.
+"""
+
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from cache import film_cache_key
+from join import join_events
+from showtimes import event_start, TIMEZONE
+
+
+# Wall-clock budget for the whole run, unset for no deadline
+SCRAPER_DEADLINE_SECONDS = os.environ.get("SCRAPER_DEADLINE_SECONDS")
+
+EVENT_HORIZON_DAYS = 7  # events this close make a film's rating urgent
+RECENT_DURATIONS = 10  # lookups the time-per-film estimate is based on
+
+NEVER_RATED, EVENT_SOON, STALE = 0, 1, 2
+
+# Measured from import, which is as close to process start as this gets
+PROCESS_STARTED = time.monotonic()
+
+
+def create_schedule(budget_seconds: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Create scheduler state.
+
+    Args:
+        budget_seconds: Seconds from process start until the deadline
+            (defaults to SCRAPER_DEADLINE_SECONDS; None for no deadline)
+
+    Returns:
+        Schedule state dict
+    """
+    if budget_seconds is None and SCRAPER_DEADLINE_SECONDS:
+        budget_seconds = float(SCRAPER_DEADLINE_SECONDS)
+    return {
+        'deadline': PROCESS_STARTED + budget_seconds if budget_seconds else None,
+        'durations': {},
+        'closed': False,
+        'lock': threading.Lock()
+    }
+
+
+def time_left(schedule: Dict[str, Any]) -> Optional[float]:
+    """Seconds until the deadline (never negative), or None without one."""
+    if schedule['deadline'] is None:
+        return None
+    return max(0.0, schedule['deadline'] - time.monotonic())
+
+
+def record_duration(schedule: Dict[str, Any], kind: str, seconds: float) -> None:
+    """Record how long a lookup of one kind ("http", "browser") took."""
+    with schedule['lock']:
+        schedule['durations'].setdefault(kind, deque(maxlen=RECENT_DURATIONS)).append(seconds)
+
+
+def estimate_duration(schedule: Dict[str, Any], kind: str, fallback: float) -> float:
+    """Typical duration of a lookup of one kind, or fallback before any finished."""
+    with schedule['lock']:
+        durations = schedule['durations'].get(kind)
+        return statistics.median(durations) if durations else fallback
+
+
+def may_start(schedule: Dict[str, Any], kind: str, fallback: float) -> bool:
+    """
+    Decide whether a lookup may start.
+
+    Args:
+        schedule: Schedule state
+        kind: Lookup kind, for its duration estimate
+        fallback: Estimate to use before any lookup of this kind finished
+
+    Returns:
+        False once the estimated lookup would finish after the deadline
+    """
+    left = time_left(schedule)
+    if left is None:
+        return True
+    estimate = estimate_duration(schedule, kind, fallback)
+    if estimate <= left:
+        return True
+    with schedule['lock']:
+        if not schedule['closed']:
+            schedule['closed'] = True
+            print(f"⏳ Deadline in {left:.0f}s, ~{estimate:.0f}s per {kind} lookup: not starting more lookups")
+    return False
+
+
+def next_event_starts(films: List[Dict], events: List[Dict], now: datetime) -> List[Optional[datetime]]:
+    """Each film's earliest upcoming event start (None if it has none)."""
+    starts = []
+    for film_events in join_events(films, events):
+        upcoming = [
+            start for start in (event_start(event, now) for event in film_events)
+            if start is not None and start >= now
+        ]
+        starts.append(min(upcoming, default=None))
+    return starts
+
+
+def prioritize(
+    films: List[Dict],
+    rating_cache: Dict[str, Dict[str, Any]],
+    events: List[Dict],
+    now: Optional[datetime] = None
+) -> List[Dict]:
+    """
+    Order films by the value of looking them up now (see module docstring).
+
+    Args:
+        films: Films to look up
+        rating_cache: Rating cache dict, for last-rated times
+        events: Parsed Metrograph events
+        now: Current time, timezone-aware (defaults to now in New York)
+
+    Returns:
+        The films, most valuable first
+    """
+    now = now or datetime.now(TIMEZONE)
+    horizon = now + timedelta(days=EVENT_HORIZON_DAYS)
+
+    def priority(item: Tuple[Dict, Optional[datetime]]) -> tuple:
+        film, start = item
+        entry = rating_cache.get(film_cache_key(film)) or {}
+        soonest = start.timestamp() if start else float("inf")
+        if not entry.get("rating"):
+            return (NEVER_RATED, soonest, "")
+        if start is not None and start <= horizon:
+            return (EVENT_SOON, soonest, "")
+        return (STALE, float("inf"), entry.get("fetched_at") or "")
+
+    # Stable sort: ties keep page order
+    ranked = sorted(zip(films, next_event_starts(films, events, now)), key=priority)
+    return [film for film, _ in ranked]
+
+
+def print_schedule(films: List[Dict], schedule: Dict[str, Any]) -> None:
+    """Log the lookup order's head and the time budget."""
+    left = time_left(schedule)
+    budget = f"{left:.0f}s left before the deadline" if left is not None else "no deadline"
+    head = ", ".join(film["title"] for film in films[:5])
+    print(f"🗓️  Lookup order ({budget}): {head}{', ...' if len(films) > 5 else ''}")
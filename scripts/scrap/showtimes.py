@@ -0,0 +1,113 @@
+"""
+Structured showtimes and a day-bucketed interval index.
+
+Metrograph shows showtimes as text like "Saturday April 18, 7:50pm",
+without a year. parse_showtime() turns that into a timezone-aware
+datetime in New York time, taking the year near the reference time
+(when the page was fetched) whose calendar agrees with the weekday, so
+listings around the new year land in the right year.
+
+build_showtime_index() lays every showing out as a [start, end, film]
+interval (epoch seconds, end assuming SHOWING_MINUTES), bucketed by
+local day and sorted by start, so "what's playing tonight / this
+weekend" is a scan over a few buckets instead of parsing every string.
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+
+TIMEZONE = ZoneInfo("America/New_York")
+
+SHOWING_MINUTES = 120  # assumed length of a showing, for interval ends
+
+SHOWTIME_RE = re.compile(
+    r"^\s*(\w+)\s+(\w+)\s+(\d{1,2}),\s*(\d{1,2}):(\d{2})\s*([ap]m)\s*$", re.IGNORECASE
+)
+
+
+def parse_showtime(time_date: str, reference: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Parse a Metrograph showtime like "Saturday April 18, 7:50pm".
+
+    Args:
+        time_date: Showtime text
+        reference: When the page was fetched (defaults to now)
+
+    Returns:
+        Timezone-aware datetime, or None if the text does not match
+    """
+    match = SHOWTIME_RE.match(time_date or "")
+    if not match:
+        return None
+    weekday, month, day, hour, minute, meridiem = match.groups()
+    hour = int(hour) % 12 + (12 if meridiem.lower() == "pm" else 0)
+    reference = (reference or datetime.now(TIMEZONE)).astimezone(TIMEZONE)
+
+    candidates = []
+    for year in (reference.year - 1, reference.year, reference.year + 1):
+        try:
+            start = datetime.strptime(f"{year} {month} {day} {hour}:{minute}", "%Y %B %d %H:%M")
+        except ValueError:
+            # Unknown month name, or February 29 outside a leap year
+            continue
+        candidates.append(start.replace(tzinfo=TIMEZONE))
+    if not candidates:
+        return None
+
+    # The weekday pins the year; fall back to the nearest date if it disagrees everywhere
+    matching = [start for start in candidates if start.strftime("%A").lower() == weekday.lower()]
+    return min(matching or candidates, key=lambda start: abs(start - reference))
+
+
+def event_start(event: Dict, reference: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    An event's start time, from its starts_at field or its showtime text.
+
+    Returns:
+        Timezone-aware datetime, or None if unknown
+    """
+    if event.get("starts_at"):
+        return datetime.fromisoformat(event["starts_at"])
+    return parse_showtime(event.get("time_date", ""), reference)
+
+
+def add_start_times(events: List[Dict], reference: Optional[datetime] = None) -> None:
+    """
+    Set each event's starts_at to an ISO 8601 time with offset ("" if
+    its showtime could not be parsed). Modifies the events in place.
+    """
+    reference = reference or datetime.now(TIMEZONE)
+    for event in events:
+        start = parse_showtime(event.get("time_date", ""), reference)
+        event["starts_at"] = start.isoformat() if start else ""
+
+
+def build_showtime_index(events_by_film: List[List[Dict]]) -> Dict[str, List[List[int]]]:
+    """
+    Bucket every showing by local day.
+
+    Args:
+        events_by_film: Each film's events (with starts_at or time_date),
+            in the same order as the films they index into
+
+    Returns:
+        Dict of "YYYY-MM-DD" -> [[start, end, film index], ...] sorted by
+        start; a showing running past midnight is listed on both days
+    """
+    days: Dict[str, List[List[int]]] = {}
+    for film_index, events in enumerate(events_by_film):
+        for event in events:
+            start = event_start(event)
+            if start is None:
+                continue
+            end = start + timedelta(minutes=SHOWING_MINUTES)
+            interval = [int(start.timestamp()), int(end.timestamp()), film_index]
+            day = start.date()
+            while day <= (end - timedelta(microseconds=1)).date():
+                days.setdefault(day.isoformat(), []).append(interval)
+                day += timedelta(days=1)
+
+    return {day: sorted(intervals) for day, intervals in sorted(days.items())}
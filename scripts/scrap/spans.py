@@ -0,0 +1,142 @@
+"""
+Structured timing spans for scraper runs.
+
+Wrap a step in `with span("name"):` to record how long it took. Every
+span is appended as one JSON line to data/spans.jsonl (tagged with the
+run id, thread and any attributes), and print_span_summary() reports
+p50/p95/max per span name and the share of the run's wall-clock time
+each took. Spans nest and overlap across threads, so shares can add up
+to more than 100%.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List
+
+
+# File path
+SPANS_FILE = os.environ.get("SCRAPER_SPANS_FILE", "./scripts/scrap/data/spans.jsonl")
+
+_run = {
+    'id': datetime.utcnow().strftime("%Y%m%dT%H%M%SZ"),
+    'started': time.monotonic(),
+    'spans': []
+}
+_lock = threading.Lock()
+
+
+def start_run() -> str:
+    """
+    Start a new run: later spans get a fresh run id and the summary
+    only covers them.
+
+    Returns:
+        The run id
+    """
+    with _lock:
+        _run['id'] = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        _run['started'] = time.monotonic()
+        _run['spans'] = []
+    return _run['id']
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block and record it.
+
+    Args:
+        name: Span type, used to group the summary
+        **attrs: Extra fields stored with the span (e.g. film title)
+
+    Yields:
+        The attrs dict, so the block can add fields such as an outcome
+    """
+    started_at = time.time()
+    start = time.monotonic()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        record = {
+            "run": _run['id'],
+            "span": name,
+            "start": round(started_at, 3),
+            "duration": round(time.monotonic() - start, 4),
+            "thread": threading.current_thread().name,
+            **attrs
+        }
+        if error:
+            record["error"] = error
+        _write(record)
+
+
+def _write(record: Dict[str, Any]) -> None:
+    """Keep a span for the summary and append it to the JSONL file."""
+    with _lock:
+        _run['spans'].append(record)
+        try:
+            with open(SPANS_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            # Spans are diagnostics; never fail a scrape over them
+            pass
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_spans() -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate this run's spans by name.
+
+    Returns:
+        Dict of span name -> count, p50, p95, max, total (seconds) and
+        share (of the run's wall-clock time)
+    """
+    with _lock:
+        spans = list(_run['spans'])
+        wall = max(time.monotonic() - _run['started'], 1e-9)
+
+    durations = {}
+    for record in spans:
+        durations.setdefault(record["span"], []).append(record["duration"])
+
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        summary[name] = {
+            "count": len(values),
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "max": values[-1],
+            "total": sum(values),
+            "share": sum(values) / wall
+        }
+    return summary
+
+
+def print_span_summary() -> None:
+    """Log per-span latency percentiles, slowest total first."""
+    summary = summarize_spans()
+    if not summary:
+        return
+
+    print(f"⏱️  Span summary for run {_run['id']} (written to {SPANS_FILE}):")
+    print(f"   {'span':<24} {'count':>6} {'p50':>8} {'p95':>8} {'max':>8} {'wall %':>7}")
+    for name, stats in sorted(summary.items(), key=lambda item: -item[1]["total"]):
+        print(
+            f"   {name:<24} {stats['count']:>6} {stats['p50']:>7.2f}s {stats['p95']:>7.2f}s "
+            f"{stats['max']:>7.2f}s {stats['share']:>6.0%}"
+        )
@@ -0,0 +1,337 @@
+"""
+Local stand-in for Letterboxd.
+
+Serves search and film pages shaped like Letterboxd's (with the
+selectors the scraper waits on) for every film in data/raw_films.json,
+using the ratings recorded in data/parsed_films.csv. Titles that have a
+capture in data/page_html were recorded hitting a Cloudflare challenge,
+so their searches serve that capture with a 403 instead.
+
+Point the scraper at it with LETTERBOXD_BASE_URL to run the browser
+worker pool offline, or use --check to drive the pool over plain HTTP
+sessions and verify throughput and results without a browser.
+
+Usage (from the repo root):
+    python scripts/scrap/standin.py --port 8765 --latency 0.5
+    LETTERBOXD_BASE_URL=http://127.0.0.1:8765 python scripts/scrap/getShowtimes.py
+    python scripts/scrap/standin.py --check --workers 4 --latency 0.2
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import unquote_plus, urljoin, urlparse
+
+from helpers import normalize_text, sanitize_filename
+
+
+# Fixtures
+RAW_FILMS_FILE = "./scripts/scrap/data/raw_films.json"
+PARSED_FILMS_FILE = "./scripts/scrap/data/parsed_films.csv"
+CAPTURE_DIR = "./scripts/scrap/data/page_html"
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><title>Search results for {query}</title></head>
+<body class="search">
+<h2 class="headline-2 prettify"><span class="film-title-wrapper"><a href="/film/{slug}/">{title}</a> <small class="metadata"><a href="/films/year/{year}/">{year}</a></small></span></h2>
+</body></html>
+"""
+
+NO_RESULTS_PAGE = """<!DOCTYPE html>
+<html><head><title>Search results for {query}</title></head>
+<body class="not-found"><h2 class="headline-2">There were no matches for your search term.</h2></body></html>
+"""
+
+FILM_PAGE = """<!DOCTYPE html>
+<html><head><title>{title} ({year}) directed by {director}</title>
+<script type="application/ld+json">
+/* <![CDATA[ */
+{structured_data}
+/* ]]> */
+</script></head>
+<body class="film">
+<h2 class="headline-2">Ratings</h2>
+<span class="average-rating"><a href="/film/{slug}/ratings/">{rating}</a></span>
+</body></html>
+"""
+
+
+def _search_key(text: str) -> str:
+    """Normalize a title the way the scraper's search query is built."""
+    return normalize_text(re.sub(r"[^\w\s]", "", text))
+
+
+def _slugify(title: str) -> str:
+    """Letterboxd-style film slug."""
+    return normalize_text(title).replace(" ", "-")
+
+
+def _synthetic_rating(title: str) -> str:
+    """Deterministic rating for films with no recorded one."""
+    digest = int(hashlib.sha1(title.encode("utf-8")).hexdigest(), 16)
+    return f"{2.0 + (digest % 25) / 10:.1f}"
+
+
+def load_catalog() -> Dict[str, Dict[str, Any]]:
+    """
+    Build the stand-in's film catalog from the fixtures.
+
+    Returns:
+        Dict of normalized search title -> film entry with title, year,
+        director, slug, rating and capture (path or None)
+    """
+    with open(RAW_FILMS_FILE, "r", encoding="utf-8") as f:
+        raw_films = json.load(f)
+
+    recorded = {}
+    with open(PARSED_FILMS_FILE, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            recorded[_search_key(row["title"])] = row
+
+    catalog = {}
+    for film in raw_films:
+        if not film["title"]:
+            continue
+        key = _search_key(film["title"])
+        row = recorded.get(key, {})
+
+        slug = _slugify(film["title"])
+        if row.get("letterboxd_url"):
+            slug = urlparse(row["letterboxd_url"]).path.strip("/").split("/")[-1]
+
+        # Same filename debug.save_page_html() gives a failed lookup (gzipped since)
+        clean_title = re.sub(r"[^\w\s]", "", film["title"])
+        capture = os.path.join(CAPTURE_DIR, f"ERROR_{sanitize_filename(clean_title)}.html")
+        if not os.path.exists(capture):
+            capture += ".gz"
+
+        catalog[key] = {
+            "title": film["title"],
+            "year": film["year"],
+            "director": ", ".join(film["directors"]),
+            "slug": slug,
+            "rating": row.get("rating") or _synthetic_rating(film["title"]),
+            "capture": os.path.abspath(capture) if os.path.exists(capture) else None,
+        }
+    return catalog
+
+
+def _make_handler(catalog: Dict[str, Dict[str, Any]], latency: float):
+    """Build a request handler class bound to a catalog."""
+    by_slug = {entry["slug"]: entry for entry in catalog.values()}
+
+    class StandinHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+
+            path = urlparse(self.path).path
+            if path.startswith("/search/"):
+                status, body = self._search(unquote_plus(path[len("/search/"):].strip("/")))
+            elif path.startswith("/film/"):
+                status, body = self._film(path[len("/film/"):].strip("/").split("/")[0])
+            else:
+                status, body = 404, NO_RESULTS_PAGE.format(query="")
+
+            payload = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _search(self, query: str) -> Tuple[int, str]:
+            title = re.sub(r"\s+\d{3,4}$", "", query)
+            entry = catalog.get(_search_key(title))
+            if not entry:
+                return 200, NO_RESULTS_PAGE.format(query=html.escape(query))
+            if entry["capture"]:
+                opener = gzip.open if entry["capture"].endswith(".gz") else open
+                with opener(entry["capture"], "rt", encoding="utf-8") as f:
+                    return 403, f.read()
+            return 200, SEARCH_PAGE.format(
+                query=html.escape(query), slug=entry["slug"],
+                title=html.escape(entry["title"]), year=entry["year"]
+            )
+
+        def _film(self, slug: str) -> Tuple[int, str]:
+            entry = by_slug.get(slug)
+            if not entry:
+                return 404, NO_RESULTS_PAGE.format(query=html.escape(slug))
+            structured_data = json.dumps({
+                "@context": "http://schema.org",
+                "@type": "Movie",
+                "name": entry["title"],
+                "aggregateRating": {
+                    "@type": "AggregateRating",
+                    "ratingValue": float(entry["rating"]),
+                    "bestRating": 5,
+                    "worstRating": 0.5
+                }
+            })
+            return 200, FILM_PAGE.format(
+                title=html.escape(entry["title"]), year=entry["year"],
+                director=html.escape(entry["director"]), slug=slug,
+                rating=entry["rating"], structured_data=structured_data
+            )
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandinHandler
+
+
+def start_standin_server(
+    port: int = 0,
+    latency: float = 0.0,
+    catalog: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stand-in server on a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+        latency: Seconds to delay every response, to mimic page loads
+        catalog: Film catalog (defaults to load_catalog())
+
+    Returns:
+        Tuple of (server, base_url); call server.shutdown() to stop it
+    """
+    catalog = catalog if catalog is not None else load_catalog()
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(catalog, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"🎭 Letterboxd stand-in serving {len(catalog)} films at {base_url}")
+    return server, base_url
+
+
+def _http_scrape(session, film: Dict, base_url: str, pacer: Dict) -> Tuple[str, str]:
+    """Look a film up on the stand-in over plain HTTP (used by --check)."""
+    from bs4 import BeautifulSoup
+    from pacer import pace, record_response, OK, CHALLENGE
+    from pool import DONE, SKIPPED
+
+    title = re.sub(r"[^\w\s]", "", film["title"])
+    pace(pacer, "search page")
+    response = session.get(f"{base_url}/search/{title} {film['year']}", timeout=30)
+    if response.status_code != 200:
+        record_response(pacer, CHALLENGE)
+        return SKIPPED, f"search returned {response.status_code}"
+    record_response(pacer, OK, response.elapsed.total_seconds())
+
+    link = BeautifulSoup(response.text, "html.parser").select_one("h2.headline-2 span.film-title-wrapper a")
+    if not link:
+        return SKIPPED, "no search result"
+    film["letterboxd_url"] = urljoin(base_url, link["href"])
+
+    pace(pacer, "film page")
+    response = session.get(film["letterboxd_url"], timeout=30)
+    record_response(pacer, OK, response.elapsed.total_seconds())
+    rating = BeautifulSoup(response.text, "html.parser").select_one("span.average-rating > a")
+    if not rating:
+        return SKIPPED, "no rating"
+    film["rating"] = rating.get_text(strip=True)
+    return DONE, ""
+
+
+def run_check(workers: int, latency: float, requests_per_minute: float) -> int:
+    """
+    Run the worker pool against the stand-in and verify every result.
+
+    Progress is recorded in a progress database inside a temporary
+    directory, so the tracked data files are untouched.
+
+    Returns:
+        Process exit code (1 if any film came back wrong)
+    """
+    import requests
+    from benchmark import sandbox
+    from pacer import create_pacer, print_pacer_summary
+    from pool import start_pool, submit, iter_results, close_pool, DONE, SKIPPED
+    from progress import open_progress, record_film, export_progress
+
+    catalog = load_catalog()
+    server, base_url = start_standin_server(latency=latency, catalog=catalog)
+    with open(RAW_FILMS_FILE, "r", encoding="utf-8") as f:
+        films = [film for film in json.load(f) if film["title"]]
+
+    # Captured challenges would otherwise back off toward minutes per request
+    pacer = create_pacer(requests_per_minute, burst=workers, max_interval=4 * 60.0 / requests_per_minute)
+    done, skipped, mismatches = [], [], []
+    start = time.monotonic()
+
+    with sandbox():
+        progress = open_progress()
+        pool = start_pool(
+            workers,
+            session_factory=requests.Session,
+            scrape=lambda session, film: _http_scrape(session, film, base_url, pacer),
+            close_session=lambda session: session.close()
+        )
+        for film in films:
+            submit(pool, film)
+
+        # Single writer
+        for film, status, reason in iter_results(pool):
+            entry = catalog[_search_key(film["title"])]
+            (done if status == DONE else skipped).append(film)
+            record_film(progress, film, status)
+            if entry["capture"]:
+                expected = (SKIPPED, None)
+            else:
+                expected = (DONE, entry["rating"])
+            if (status, film.get("rating") if status == DONE else None) != expected:
+                mismatches.append(f"{film['title']}: got {status} {film.get('rating')} ({reason})")
+        export_progress(progress)
+        progress.close()
+        close_pool(pool)
+
+    elapsed = time.monotonic() - start
+    server.shutdown()
+    print_pacer_summary(pacer)
+    print(
+        f"📊 {len(films)} films with {workers} worker(s) in {elapsed:.1f}s "
+        f"({len(films) / elapsed:.1f} films/s): {len(done)} done, {len(skipped)} skipped"
+    )
+
+    if mismatches:
+        print(f"❌ {len(mismatches)} unexpected result(s):")
+        for mismatch in mismatches:
+            print(f"   {mismatch}")
+        return 1
+    print("✅ Every film matched the stand-in's catalog")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--check", action="store_true", help="Run the worker pool against the stand-in and verify results")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=600.0, help="Global requests per minute in --check")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return run_check(args.workers, args.latency, args.rate)
+
+    server, _ = start_standin_server(args.port, args.latency)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
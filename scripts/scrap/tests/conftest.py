@@ -0,0 +1,17 @@
+"""
+Tests for the scraper's pure functions.
+
+The scraper's modules import each other by bare name, as when run from
+scripts/scrap, so that directory goes on sys.path.
+
+Usage (from the repo root):
+    python -m pytest scripts/scrap/tests
+"""
+
+import os
+import sys
+
+SCRAP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(SCRAP_DIR, "data")
+
+sys.path.insert(0, SCRAP_DIR)
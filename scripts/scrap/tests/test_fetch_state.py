@@ -0,0 +1,16 @@
+from fetch_state import remember_validators
+
+
+def test_full_response_replaces_validators():
+    state = {"etag": '"old"', "last_modified": "Mon, 01 Jan 2026 00:00:00 GMT"}
+    remember_validators(state, {"ETag": '"new"'})
+    assert state == {"etag": '"new"', "last_modified": None}
+
+
+def test_not_modified_keeps_validators_it_omits():
+    state = {"etag": '"old"', "last_modified": "Mon, 01 Jan 2026 00:00:00 GMT"}
+    remember_validators(state, {}, keep_missing=True)
+    assert state == {"etag": '"old"', "last_modified": "Mon, 01 Jan 2026 00:00:00 GMT"}
+
+    remember_validators(state, {"ETag": '"newer"'}, keep_missing=True)
+    assert state["etag"] == '"newer"'
@@ -0,0 +1,29 @@
+from history import build_history
+
+
+def test_dates_without_snapshots_carry_the_last_lineup():
+    snapshots = [
+        ("films", "2026-01-01", "a"),
+        ("events", "2026-01-01", "e"),
+        ("films", "2026-01-01", "b"),
+        ("films", "2026-01-04", "c"),
+    ]
+    parsed = {"a": ["X"], "b": ["Y"], "c": ["Z"], "e": [["Y", "Friday January 2, 7:00pm"]]}
+
+    history = build_history(snapshots, parsed)
+    titles = history["titles"]
+    dates = history["dates"]
+
+    assert titles == ["X", "Y", "Z"]
+    assert list(dates) == ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"]
+    # Everything seen on a date with snapshots, the day's last one after it
+    assert dates["2026-01-01"]["films"] == [0, 1]
+    assert dates["2026-01-02"]["films"] == [1]
+    assert dates["2026-01-03"]["films"] == [1]
+    assert dates["2026-01-04"]["films"] == [2]
+    assert all(day["events"] == [[1, "Friday January 2, 7:00pm"]] for day in dates.values())
+
+
+def test_unparsed_snapshots_are_ignored():
+    history = build_history([("films", "2026-01-01", "missing")], {})
+    assert history["dates"] == {}
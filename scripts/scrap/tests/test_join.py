@@ -0,0 +1,48 @@
+from join import EXACT_CONFIDENCE, STRIPPED_CONFIDENCE, FUZZY_MIN_CONFIDENCE, build_join_index, match_event, join_events
+
+
+FILMS = [
+    {"title": "Billy Madison", "directors": "['Tamra Davis']"},
+    {"title": "Fantastic Planet", "directors": "['René Laloux']"},
+    {"title": "The Double Life of Véronique", "directors": "['Krzysztof Kieślowski']"},
+]
+
+
+def test_exact_title_match():
+    assert match_event(build_join_index(FILMS), {"title": "BILLY MADISON"}) == (0, EXACT_CONFIDENCE)
+
+
+def test_presents_and_preceded_by_are_stripped():
+    index = build_join_index(FILMS)
+    assert match_event(index, {"title": "ACE Presents Billy Madison"}) == (0, STRIPPED_CONFIDENCE)
+    assert match_event(index, {"title": "Fantastic Planet preceded by The Finesse"}) == (1, STRIPPED_CONFIDENCE)
+
+
+def test_fuzzy_match_is_less_confident_than_title_matches():
+    i, confidence = match_event(build_join_index(FILMS), {"title": "The Double Life of Veronique 35mm"})
+    assert i == 2
+    assert FUZZY_MIN_CONFIDENCE <= confidence < STRIPPED_CONFIDENCE
+
+
+def test_director_mismatch_lowers_fuzzy_confidence():
+    index = build_join_index(FILMS)
+    event = {"title": "The Double Life of Veronique 35mm"}
+    _, agreeing = match_event(index, {**event, "directors": "['Krzysztof Kieślowski']"})
+    disagreeing = match_event(index, {**event, "directors": "['Someone Else']"})
+    assert disagreeing is None or disagreeing[1] < agreeing
+
+
+def test_unrelated_event_is_unmatched():
+    assert match_event(build_join_index(FILMS), {"title": "Commissary Closed"}) is None
+
+
+def test_join_events_keeps_calendar_order_per_film():
+    events = [
+        {"title": "Billy Madison", "time_date": "first"},
+        {"title": "Fantastic Planet", "time_date": "other"},
+        {"title": "ACE Presents Billy Madison", "time_date": "second"},
+    ]
+    joined = join_events(FILMS, events)
+    assert [event["time_date"] for event in joined[0]] == ["first", "second"]
+    assert [event["match_confidence"] for event in joined[0]] == [EXACT_CONFIDENCE, STRIPPED_CONFIDENCE]
+    assert joined[2] == []
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from output import _as_list, build_films_artifact, FILMS_OUTPUT_FIELDS
+
+
+@pytest.mark.parametrize("value, expected", [
+    (["A", "B"], ["A", "B"]),
+    ("", []),
+    (None, []),
+    ("['James Algar', 'David Hand']", ["James Algar", "David Hand"]),
+    # str() of a list switches to double quotes for a name with an apostrophe
+    (str(["O'Brien", "Smith"]), ["O'Brien", "Smith"]),
+    (str(["Smith", "O'Brien"]), ["Smith", "O'Brien"]),
+    ('[{"title": "X", "ok": true, "note": null}]', [{"title": "X", "ok": True, "note": None}]),
+    ("Solo", ["Solo"]),
+    ("[broken", ["[broken"]),
+])
+def test_as_list(value, expected):
+    assert _as_list(value) == expected
+
+
+def test_films_artifact_is_columnar_and_typed():
+    events = [{"title": "A", "time_date": "Sunday October 18, 7:00pm", "starts_at": "2026-10-18T19:00:00-04:00"}]
+    films = [
+        {"title": "A", "directors": "['X']", "year": "1999", "rating": "3.5", "events": json.dumps(events)},
+        {"title": "B", "directors": "", "year": "", "rating": "n/a", "events": ""},
+    ]
+    artifact = build_films_artifact(films)
+
+    assert artifact["count"] == 2
+    assert list(artifact["columns"]) == FILMS_OUTPUT_FIELDS
+    assert artifact["columns"]["directors"] == [["X"], []]
+    assert artifact["columns"]["year"] == [1999, None]
+    assert artifact["columns"]["rating"] == [3.5, None]
+    assert artifact["showtimes"] == {"2026-10-18": [[1792364400, 1792371600, 0]]}
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from conftest import DATA_DIR
+from extract import iter_films, iter_events
+from parsing import BACKENDS, _is_installed
+
+
+INSTALLED = [backend for backend in BACKENDS if _is_installed(backend)]
+
+
+def _read(name: str) -> str:
+    with open(os.path.join(DATA_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("backend", INSTALLED)
+def test_films_match_across_backends(backend):
+    html = _read("metrograph.html")
+    expected = list(iter_films(html, "html.parser"))
+    assert expected
+    assert list(iter_films(html, backend)) == expected
+
+
+@pytest.mark.parametrize("backend", INSTALLED)
+def test_events_match_across_backends(backend):
+    html = _read("metrograph_events.html")
+    expected = list(iter_events(html, "html.parser"))
+    assert expected
+    assert list(iter_events(html, backend)) == expected
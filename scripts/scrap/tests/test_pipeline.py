@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import Stage, run_dag
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quits = 0
+
+    def quit(self):
+        self.quits += 1
+
+
+def test_stages_run_after_their_dependencies():
+    results = run_dag([
+        Stage("merge", lambda r: r["a"] + r["b"], ("a", "b")),
+        Stage("a", lambda r: 1),
+        Stage("b", lambda r: r["a"] + 1, ("a",)),
+    ])
+    assert results == {"a": 1, "b": 2, "merge": 3}
+
+
+def test_failure_cleans_up_finished_stages():
+    driver = FakeDriver()
+
+    def films(results):
+        raise RuntimeError("films page down")
+
+    with pytest.raises(RuntimeError, match="films page down"):
+        run_dag([
+            Stage("browser", lambda r: driver, cleanup=lambda d: d.quit()),
+            Stage("films", films),
+            Stage("events", lambda r: [], ("browser",)),
+        ])
+    assert driver.quits == 1
+
+
+def test_cleanup_does_not_run_on_success():
+    driver = FakeDriver()
+    run_dag([Stage("browser", lambda r: driver, cleanup=lambda d: d.quit())])
+    assert driver.quits == 0
+
+
+def test_unsatisfiable_dependencies():
+    with pytest.raises(ValueError):
+        run_dag([Stage("a", lambda r: 1, ("missing",))])
+
+
+def test_main_thread_stage_runs_on_the_calling_thread_alongside_others():
+    threads = {}
+
+    def slow(results):
+        threads["posters"] = threading.current_thread()
+        time.sleep(0.2)
+
+    def ratings(results):
+        threads["ratings"] = threading.current_thread()
+
+    run_dag([
+        Stage("films", lambda r: 1),
+        Stage("posters", slow, ("films",)),
+        Stage("ratings", ratings, ("films",), main_thread=True),
+    ])
+    assert threads["ratings"] is threading.main_thread()
+    assert threads["posters"] is not threading.main_thread()
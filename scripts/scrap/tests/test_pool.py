@@ -0,0 +1,69 @@
+import queue
+import threading
+import time
+
+from pool import iter_results
+
+
+def _pool(submitted: int) -> dict:
+    return {"results": queue.Queue(), "collected": 0, "submitted": submitted}
+
+
+def _finish_after(pool: dict, seconds: float) -> None:
+    timer = threading.Timer(seconds, lambda: pool["results"].put(({}, "done", "")))
+    timer.daemon = True
+    timer.start()
+
+
+def test_drain_stops_at_the_deadline():
+    pool = _pool(2)
+    _finish_after(pool, 0.1)
+    _finish_after(pool, 0.6)
+    start = time.monotonic()
+
+    results = list(iter_results(pool, deadline=start + 0.3))
+
+    # The wait does not restart after the first result
+    assert len(results) == 1
+    assert time.monotonic() - start < 0.5
+    assert pool["collected"] == 1
+
+
+def test_passed_deadline_collects_nothing():
+    pool = _pool(1)
+    pool["results"].put(({}, "done", ""))
+    assert list(iter_results(pool, deadline=time.monotonic() - 1)) == []
+
+
+def test_non_blocking_yields_only_available_results():
+    pool = _pool(2)
+    pool["results"].put(({}, "done", ""))
+    assert len(list(iter_results(pool, block=False))) == 1
+
+
+def test_close_without_waiting_quits_sessions_stuck_in_lookups():
+    from pool import start_pool, submit, close_pool
+
+    started, quit = threading.Event(), []
+
+    class Session:
+        def quit(self):
+            quit.append(self)
+
+    def scrape(session, film):
+        started.set()
+        time.sleep(2)  # a page load that outlives the deadline
+        return "done", ""
+
+    pool = start_pool(1, session_factory=Session, scrape=scrape)
+    submit(pool, {"title": "A"})
+    assert started.wait(1)
+
+    start = time.monotonic()
+    close_pool(pool, wait=False)
+
+    assert len(quit) == 1
+    assert time.monotonic() - start < 1
+    # The worker's own cleanup does not quit it a second time
+    pool["threads"][0].join(3)
+    assert len(quit) == 1
@@ -0,0 +1,43 @@
+import os
+
+from progress import DONE, SKIPPED, open_progress, record_film, load_films, load_processed_titles
+
+
+def test_rebuilds_from_export_with_latest_record_winning(tmp_path):
+    db, export = str(tmp_path / "progress.sqlite3"), str(tmp_path / "progress.jsonl")
+    conn = open_progress(db, export)
+    record_film(conn, {"title": "A"}, DONE, export)
+    record_film(conn, {"title": "B"}, SKIPPED, export)
+    record_film(conn, {"title": "A", "rating": "3.9"}, DONE, export)
+    conn.close()
+
+    # Killed mid-append, then the database is gone, as on a fresh checkout
+    with open(export, "a", encoding="utf-8") as f:
+        f.write('{"title": "C", "sta')
+    os.remove(db)
+
+    conn = open_progress(db, export)
+    assert load_films(conn, DONE) == [{"title": "A", "rating": "3.9"}]
+    assert load_processed_titles(conn) == {"A", "B"}
+    record_film(conn, {"title": "D"}, DONE, export)
+    conn.close()
+
+    os.remove(db)
+    conn = open_progress(db, export)
+    assert load_processed_titles(conn) == {"A", "B", "D"}
+    conn.close()
+
+
+def test_seeds_from_legacy_csvs_without_an_export(tmp_path, monkeypatch):
+    import progress
+
+    parsed, skipped = tmp_path / "parsed_films_progress.csv", tmp_path / "skipped_films_progress.csv"
+    parsed.write_text("title,rating\nA,3.5\n", encoding="utf-8")
+    skipped.write_text("title,letterboxd_url\nB,\n", encoding="utf-8")
+    monkeypatch.setattr(progress, "LEGACY_PROGRESS_FILES", {DONE: str(parsed), SKIPPED: str(skipped)})
+
+    conn = open_progress(str(tmp_path / "progress.sqlite3"), str(tmp_path / "progress.jsonl"))
+    assert load_films(conn, DONE) == [{"title": "A", "rating": "3.5"}]
+    assert load_processed_titles(conn, SKIPPED) == {"B"}
+    conn.close()
+    assert (tmp_path / "progress.jsonl").exists()
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from showtimes import TIMEZONE, parse_showtime, add_start_times, build_showtime_index
+
+
+def _at(*args) -> datetime:
+    return datetime(*args, tzinfo=TIMEZONE)
+
+
+def test_parse_showtime_same_year():
+    assert parse_showtime("Saturday October 24, 7:50pm", _at(2026, 10, 18)) == _at(2026, 10, 24, 19, 50)
+
+
+def test_parse_showtime_rolls_into_next_year():
+    # January listings fetched in December
+    assert parse_showtime("Friday January 1, 12:15am", _at(2026, 12, 28)) == _at(2027, 1, 1, 0, 15)
+
+
+def test_parse_showtime_rolls_back_into_last_year():
+    # A late-December listing still on the page in January
+    assert parse_showtime("Thursday December 31, 9:00pm", _at(2027, 1, 2)) == _at(2026, 12, 31, 21, 0)
+
+
+def test_parse_showtime_weekday_pins_the_year():
+    # April 18 is a Saturday in 2026 but a Sunday in 2027
+    assert parse_showtime("Sunday April 18, 12:00pm", _at(2026, 10, 18)).year == 2027
+
+
+def test_parse_showtime_rejects_other_text():
+    assert parse_showtime("Sold out") is None
+    assert parse_showtime("") is None
+    assert parse_showtime("Monday Smarch 3, 7:00pm") is None
+
+
+def test_add_start_times():
+    events = [{"time_date": "Sunday October 18, 11:30pm"}, {"time_date": "TBA"}]
+    add_start_times(events, _at(2026, 10, 18))
+    assert [event["starts_at"] for event in events] == ["2026-10-18T23:30:00-04:00", ""]
+
+
+def test_showtime_index_buckets_by_day_across_midnight():
+    late = {"starts_at": "2026-10-18T23:30:00-04:00"}
+    early = {"starts_at": "2026-10-19T13:00:00-04:00"}
+    index = build_showtime_index([[early], [late], [{"starts_at": ""}]])
+
+    assert list(index) == ["2026-10-18", "2026-10-19"]
+    assert [film for _, _, film in index["2026-10-18"]] == [1]
+    # The late showing runs past midnight, so it is listed first on the next day too
+    assert [film for _, _, film in index["2026-10-19"]] == [1, 0]
+    assert all(end - start == 120 * 60 for day in index.values() for start, end, _ in day)
@@ -0,0 +1,51 @@
+import meta from '$lib/data/meta.json';
+import type { ShowtimeIndex } from '$lib/utils/showtimes';
+
+export interface Film {
+	title: string;
+	imageUrl: string;
+	directors: string[];
+	synopsis: string;
+	year: number | null;
+	rating: number | null;
+	letterboxd_url: string;
+	event_description: string;
+	event_time_date: string;
+	event_starts_at: string;
+	events: {
+		title: string;
+		description: string;
+		time_date: string;
+		starts_at: string;
+		match_confidence: number;
+	}[];
+	poster_webp: string;
+	poster_avif: string;
+}
+
+interface FilmsArtifact {
+	version: number;
+	count: number;
+	columns: Record<string, unknown[]>;
+	showtimes: ShowtimeIndex;
+}
+
+// films.<hash>.json is stored column by column; rebuild one object per film
+const toRows = ({ count, columns }: FilmsArtifact) =>
+	Array.from({ length: count }, (_, i) =>
+		Object.fromEntries(Object.entries(columns).map(([field, values]) => [field, values[i]]))
+	) as Film[];
+
+/**
+ * @description Fetch the films artifact that meta.json points at; call it from the browser so the
+ * content-hashed file is cached instead of being inlined into the prerendered page
+ * @returns {Promise<{ films: Film[], showtimes: ShowtimeIndex }>} - One object per film, and the day-bucketed showtime index
+ */
+export default async () => {
+	const artifact: FilmsArtifact = await fetch(meta.films).then((res) => res.json());
+	return {
+		films: toRows(artifact),
+		// Version 1 artifacts predate the showtime index
+		showtimes: artifact.showtimes ?? {}
+	};
+};
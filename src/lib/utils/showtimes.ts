@@ -0,0 +1,30 @@
+export type ShowtimeIndex = Record<string, [number, number, number][]>;
+
+const dayKey = new Intl.DateTimeFormat('en-CA', { timeZone: 'America/New_York' });
+
+/**
+ * @description Find the films showing during a time range, using the day-bucketed showtime index
+ * @param {ShowtimeIndex} index - `showtimes` from the films artifact: day -> [start, end, film] sorted by start (epoch seconds)
+ * @param {[Date, Date]} range - Start and end of the range
+ * @returns {Number[]} - Indices of films with a showing overlapping the range, soonest first
+ */
+export default (index: ShowtimeIndex, [from, to]: [Date, Date]) => {
+	const fromSec = from.getTime() / 1000;
+	const toSec = to.getTime() / 1000;
+
+	// Visit each New York day the range touches (12h steps never skip a day across DST)
+	const days = new Set<string>([dayKey.format(to)]);
+	for (let t = from.getTime(); t <= to.getTime(); t += 12 * 3600 * 1000) {
+		days.add(dayKey.format(new Date(t)));
+	}
+
+	const showings: [number, number][] = [];
+	for (const day of days) {
+		for (const [start, end, film] of index[day] ?? []) {
+			if (start >= toSec) break; // buckets are sorted by start
+			if (end > fromSec) showings.push([start, film]);
+		}
+	}
+	showings.sort((a, b) => a[0] - b[0]);
+	return [...new Set(showings.map(([, film]) => film))];
+};